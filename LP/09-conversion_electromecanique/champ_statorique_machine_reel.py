@@ -13,7 +13,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import matplotlib.animation as anim
 from matplotlib.widgets import Slider, Button
 
 
@@ -81,9 +80,10 @@ def traceCercle (figure, pos, rayon, couleur='white', rempli=True, epaisseur=.0)
   figure.add_patch (cercle)
 
 # trace une fleche
-def traceFleche (figure, base, tete, largeur=1.0, couleur='black'):
+def traceFleche (figure, base, tete, largeur=1.0, couleur='black', plan=1):
     taille = 0.1 * largeur
-    figure.arrow (base[0], base[1], tete[0], tete[1], shape='full', lw=largeur, head_width=taille, color=couleur)
+    return figure.arrow (base[0], base[1], tete[0], tete[1], shape='full', lw=largeur,
+        head_width=taille, color=couleur, zorder=plan)
 
 # affiche du texte
 def traceTexte (figure, pos, texte, couleur='black', vert="bottom", horiz="right"):
@@ -143,15 +143,31 @@ def traceBobinage (fig, r, a, pos, couleur, sortant=True):
     traceEncoche (fig, r, a, pos)
     traceBobine (fig, r, 0.9*a, pos, couleur, sortant)
 
-# trace le moteur synchrone
-def traceMoteurSynchrone (N, deltaTheta, triphasee, fig):
-    fig.clear ()
-    # Zone de tracé
+# zone de tracé du moteur et texte de l'angle du champ total
+def initialiseMoteur (fig):
     initialiseAxes (fig, (-3, 3), (-3, 3))
     fig.set_aspect ('equal')
     traceTexte (fig, (-.7, -3), r'$\alpha_{max}=$' + f'{0 : 3.1f}' + '°', vert="top", horiz="left")
 
-    # trace la machine
+# géométrie statique (stator, rotor et bobines) déjà tracée pour chaque
+# couple (N, triphasée) : elle n'est construite qu'une fois, changer de
+# couple ne fait que masquer l'une et afficher l'autre
+geometries = {}
+
+# trace le moteur synchrone
+def traceMoteurSynchrone (N, deltaTheta, triphasee, fig):
+    cle = (N, triphasee)
+    if cle not in geometries:
+        avant = set (fig.patches) | set (fig.lines)
+        traceGeometrie (N, deltaTheta, triphasee, fig)
+        geometries[cle] = [artiste for artiste in list (fig.patches) + list (fig.lines) if artiste not in avant]
+    for autre, artistes in geometries.items ():
+        if artistes[0].get_visible () != (autre == cle):
+            for artiste in artistes:
+                artiste.set_visible (autre == cle)
+
+# trace la machine et ses bobines
+def traceGeometrie (N, deltaTheta, triphasee, fig):
     traceMachine (fig, 2.9, 'grey')
     r = 2.3
     decalage = 0.1
@@ -177,25 +193,30 @@ def traceMoteurSynchrone (N, deltaTheta, triphasee, fig):
 """
 Fonction pour tracer le champ
 """
+# flèches du champ dans l'entrefer et du champ total, créées une seule fois
+# puis déplacées
+fleches = []
+
 # trace le champ dans l'entrefer
 # r : taille de la machine
 # l : longueur des vecteurs
 def traceVecteurChamp (t, r, l, triphasee, figure):
+    if not fleches:
+        fleches.extend (traceFleche (figure, (0, 0), (0, 0), plan=3) for i in range (16))
+        fleches.append (traceFleche (figure, (0, 0), (0, 0), 1.3, 'midnightblue', 3))
     # trace le champ dans l'entrefer
     deuxPi = 2*np.pi
     nombreVecteurs = 16
+    angle = (np.arange (nombreVecteurs) - 8) * deuxPi / nombreVecteurs
+    cosi = np.cos (angle)
+    sini = np.sin (angle)
+    if triphasee:
+        cost = np.cos (angle - deuxPi*t)
+    else:
+        cost = np.cos (angle) * np.cos (deuxPi*t)
+    ri = 3*r/4
     for i in range (0, nombreVecteurs):
-        angle = (i - 8) * deuxPi / nombreVecteurs
-        cosi = np.cos (angle)
-        sini = np.sin (angle)
-        if triphasee:
-            cost = np.cos (angle - deuxPi*t)
-            sint = np.sin (angle - deuxPi*t)
-        else:
-            cost = np.cos (angle) * np.cos (deuxPi*t)
-            sint = np.sin (angle) * np.cos (deuxPi*t)
-        ri = 3*r/4
-        traceFleche (figure, (ri*cosi, ri*sini), (l*cost*cosi, l*cost*sini))
+        fleches[i].set_data (x=ri*cosi[i], y=ri*sini[i], dx=l*cost[i]*cosi[i], dy=l*cost[i]*sini[i])
     # trace le champ total et affiche son angle
     base = [-r/2 * np.cos (deuxPi * t), 0]
     tete = [r * np.cos (deuxPi * t), 0]
@@ -204,7 +225,7 @@ def traceVecteurChamp (t, r, l, triphasee, figure):
         base[1] = -r/2 * np.sin (deuxPi * t)
         tete[1] = r * np.sin (deuxPi * t)
         texteAngle = f'{360 * t : 3.1f}'
-    traceFleche (figure, base, tete, 1.3, 'midnightblue')
+    fleches[-1].set_data (x=base[0], y=base[1], dx=tete[0], dy=tete[1])
     figure.texts[0].set_text (r'$\alpha_{max}=$' + texteAngle + '°')
 
 # initialise le diagramme du champ
@@ -231,14 +252,12 @@ def traceAxes (figure):
 """
 Fonctions de calcul des champs
 """
-# détermination du signe du champ
+# détermination du signe du champ (d peut être un tableau)
 def positif (d):
-    if (d < -2):
-        d = d + 2
-    if (d > 2):
-        d = d - 2
+    d = np.where (d < -2, d + 2, d)
+    d = np.where (d > 2, d - 2, d)
     # B > 0 si dans [-π/2, π/2] ou [-2π, -3π/2] U [3π/2, 2π]
-    return (d < -1.5 or d > -0.5) and (d < 0.5 or d > 1.5)
+    return ((d < -1.5) | (d > -0.5)) & ((d < 0.5) | (d > 1.5))
 
 # calcul du champ d'une bobine
 def champ (theta, angle, t, triphasee):
@@ -247,12 +266,7 @@ def champ (theta, angle, t, triphasee):
     if not triphasee:
         Bmax = 5*np.cos (2*np.pi*t)
         x = x + 2*np.pi*t
-    for i in range (0, 150):
-        if positif (x[i] / np.pi):
-            x[i] = Bmax
-        else:
-            x[i] = -Bmax
-    return x
+    return np.where (positif (x / np.pi), Bmax, -Bmax)
 
 # calcul du champ total
 def champTotal (theta, t, N, deltaTheta, triphasee):
@@ -266,7 +280,7 @@ def champTotal (theta, t, N, deltaTheta, triphasee):
 """
 Fonctions de mise à jour
 """
-# mise à jour du système
+# mise à jour du système, renvoie les éléments modifiés
 def miseAJour (val):
     N = choixNombreBobine.val
     deltaTheta = enRadian (180) / N
@@ -283,14 +297,44 @@ def miseAJour (val):
         champSinus = 5*np.cos (x)*np.cos (2*np.pi*t)
     diagramme.lines[0].set_data (x, champSinus)
     diagramme.lines[1].set_data (x, champTotal (x, t, N, deltaTheta, triphasee))
-
-# animation
-def animer (i):
-    deltaT = i / 30
-    t = deltaT - np.floor (deltaT)
-    if lancerAnimation.label.get_text() == 'Arrêter l\'animation':
-        choixTemps.set_val (t)
-        miseAJour (0)
+    return elementsMobiles ()
+
+# éléments redessinés à chaque image de l'animation (y compris le curseur du
+# temps)
+def elementsMobiles ():
+    return fleches + [synchrone.texts[0], diagramme.lines[0], diagramme.lines[1],
+        choixTemps.poly, choixTemps.valtext] + list (choixTemps.ax.lines)
+
+# indique si l'animation est lancée
+def animationLancee ():
+    return lancerAnimation.label.get_text() == 'Arrêter l\'animation'
+
+# fond de la figure sans les éléments mobiles, recapturé après chaque tracé
+# complet (redimensionnement, nombre de bobines, mono ou triphasée, curseurs)
+fond = None
+def captureFond (event):
+    global fond
+    fond = fenetre.canvas.copy_from_bbox (fenetre.bbox)
+
+# image de l'animation : le fond est restauré et seuls les éléments mobiles
+# sont redessinés puis blittés. Le minuteur ne tourne que pendant l'animation
+image = 0
+def animer ():
+    global image
+    if fond is None:
+        return
+    image = (image + 1) % 30
+    # déplace le curseur sans redessiner toute la fenêtre
+    choixTemps.eventson = False
+    choixTemps.drawon = False
+    choixTemps.set_val (image / 30)
+    choixTemps.eventson = True
+    choixTemps.drawon = True
+    mobiles = miseAJour (0)
+    fenetre.canvas.restore_region (fond)
+    for artiste in mobiles:
+        fenetre.draw_artist (artiste)
+    fenetre.canvas.blit (fenetre.bbox)
 
 
 """
@@ -303,13 +347,21 @@ def choixMonoOuTriphasee (val):
         diagramme.plot ([0,0], [0,0], 'b-')
         choixPhase.label.set_text ('Triphasée')
     miseAJour (0)
+    fenetre.canvas.draw_idle ()
 
+# à l'arrêt les éléments mobiles sont dessinés avec le reste de la figure,
+# pendant l'animation ils sont exclus du fond et seulement blittés
 def choixLancerAnimation (val):
     if lancerAnimation.label.get_text() == 'Lancer l\'animation':
         lancerAnimation.label.set_text ('Arrêter l\'animation')
+        minuteur.start ()
     else:
         lancerAnimation.label.set_text ('Lancer l\'animation')
+        minuteur.stop ()
+    for artiste in elementsMobiles ():
+        artiste.set_animated (animationLancee ())
     miseAJour (0)
+    fenetre.canvas.draw_idle ()
 
 
 """
@@ -318,6 +370,7 @@ Partie principale
 # trace les axes et défini le nombre de bobines
 traceAxes (diagramme)
 initialiseDiagramme (diagramme)
+initialiseMoteur (synchrone)
 miseAJour (0)
 
 # mise à jour interactive
@@ -326,7 +379,10 @@ choixNombreBobine.on_changed (miseAJour)
 choixPhase.on_clicked (choixMonoOuTriphasee)
 lancerAnimation.on_clicked (choixLancerAnimation)
 
-# lance l'animation
-ani = anim.FuncAnimation (fenetre, animer, 60, interval = 16)
+# animation par blitting : le fond est recapturé à chaque tracé complet, le
+# minuteur est lancé et arrêté par le bouton
+fenetre.canvas.mpl_connect ('draw_event', captureFond)
+minuteur = fenetre.canvas.new_timer (interval = 16)
+minuteur.add_callback (animer)
 
 plt.show()
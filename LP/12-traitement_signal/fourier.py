@@ -8,6 +8,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import odeint
 import matplotlib 
+from matplotlib.widgets import Slider, CheckButtons
 
 plt.rcParams.update({'font.size': 22})
 
@@ -19,17 +20,187 @@ def carreFourier (N, omega, t):
         total = total + np.sin (n * omega * t) / n
     return 4 * total / np.pi
 
+# coefficients complexes c_n = a_n - i b_n (n = 0..N) de signaux d'amplitude 1,
+# la série s'écrit s(t) = Re sum_n c_n exp(i n omega t)
+def coefficientsCarre (N):
+    n = np.arange (N + 1)
+    return np.where (n % 2 == 1, -4j / (np.pi * np.maximum (n, 1)), 0)
+
+def coefficientsTriangle (N):
+    n = np.arange (N + 1)
+    signe = np.where ((n // 2) % 2 == 0, 1, -1)
+    return np.where (n % 2 == 1, -8j * signe / (np.pi * np.maximum (n, 1))**2, 0)
+
+def coefficientsDentDeScie (N):
+    n = np.arange (N + 1)
+    return np.where (n > 0, -2j * (-1)**(n + 1) / (np.pi * np.maximum (n, 1)), 0)
+
+# coefficients d'une période échantillonnée (harmoniques au-delà de la moitié
+# du nombre d'échantillons nulles)
+def coefficientsEchantillons (signal, N):
+    spectre = np.fft.rfft (signal) / len (signal)
+    spectre[1:] *= 2
+    if len (signal) % 2 == 0:
+        spectre[-1] /= 2
+    coefficients = np.zeros (N + 1, dtype=complex)
+    coefficients[:min (N + 1, len (spectre))] = spectre[:N + 1]
+    return coefficients
+
+# sommes partielles S_N (harmoniques n <= N) pour toutes les valeurs de Ns, sur
+# M points par période et `periodes` périodes à partir de t = 0. Aux points
+# t_j = j T / M, exp(i n omega t_j) ne dépend que de n modulo M : les
+# coefficients sont repliés modulo M, de façon incrémentale d'un N au suivant,
+# et chaque somme partielle exacte est une seule FFT inverse de taille M
+def sommesPartielles (coefficients, Ns, M, periodes=1):
+    Ns = np.asarray (Ns)
+    repli = np.zeros (M, dtype=complex)
+    sommes = np.empty ((len (Ns), M))
+    debut = 0
+    for i in np.argsort (Ns):
+        n = np.arange (debut, Ns[i] + 1)
+        repli += np.bincount (n % M, coefficients[n].real, M) + 1j * np.bincount (n % M, coefficients[n].imag, M)
+        sommes[i] = M * np.fft.ifft (repli).real
+        debut = max (debut, Ns[i] + 1)
+    return np.tile (sommes, periodes)
+
+# somme partielle conservée sur une grille t quelconque : passer de N à N'
+# n'ajoute (ou ne retire) que les harmoniques non nulles comprises entre les
+# deux, par paquets pour borner la mémoire. La somme pondérée sum n c_n e_n
+# est conservée aussi, ce qui donne la moyenne de Fejér sans recalcul
+#     sigma_N = (1 / (N + 1)) sum_{k <= N} S_k = S_N - sum n c_n e_n / (N + 1)
+class SommeIncrementale:
+    def __init__ (self, coefficients, omega, t, taillePaquet=256):
+        self.coefficients = coefficients
+        self.omega = omega
+        self.t = t
+        self.taillePaquet = taillePaquet
+        self.N = 0
+        self.somme = np.full (len (t), coefficients[0].real)
+        self.sommePonderee = np.zeros (len (t))
+
+    # termes Re(c_n exp(i n omega t)) pour les harmoniques non nulles de n
+    def termes (self, n, poids=1):
+        n = n[self.coefficients[n] != 0]
+        facteurs = (poids * self.coefficients)[n] if np.ndim (poids) else self.coefficients[n]
+        return n, (facteurs[:, None] * np.exp (1j * self.omega * n[:, None] * self.t[None, :])).real
+
+    # ajoute (signe = 1) ou retire (signe = -1) les harmoniques debut..fin-1
+    def ajoute (self, debut, fin, signe):
+        for paquet in range (debut, fin, self.taillePaquet):
+            n, termes = self.termes (np.arange (paquet, min (paquet + self.taillePaquet, fin)))
+            self.somme += signe * termes.sum (axis=0)
+            self.sommePonderee += signe * (n @ termes)
+
+    # somme partielle jusqu'à l'harmonique N
+    def regle (self, N):
+        if N > self.N:
+            self.ajoute (self.N + 1, N + 1, 1)
+        else:
+            self.ajoute (N + 1, self.N + 1, -1)
+        self.N = N
+        return self.somme
+
+    def fejer (self):
+        return self.somme - self.sommePonderee / (self.N + 1)
+
+    # facteurs sigma de Lanczos sinc(n / (N + 1)) : ils dépendent de N, la
+    # somme est donc recalculée entièrement (O(N) par point)
+    def lanczos (self):
+        sigma = np.sinc (np.arange (len (self.coefficients)) / (self.N + 1))
+        total = np.full (len (self.t), self.coefficients[0].real)
+        for paquet in range (1, self.N + 1, self.taillePaquet):
+            n, termes = self.termes (np.arange (paquet, min (paquet + self.taillePaquet, self.N + 1)), sigma)
+            total += termes.sum (axis=0)
+        return total
+
+# amplitude (au-dessus du niveau du signal) et position du dépassement
+def depassement (t, somme, niveau=1):
+    i = np.argmax (somme)
+    return somme[i] - niveau, t[i]
+
+# explorateur du phénomène de Gibbs pour le signal carré : le curseur règle le
+# nombre d'harmoniques impaires de carreFourier, la grille est resserrée
+# autour de la discontinuité en t = 0 pour résoudre le premier maximum
+def exploreGibbs (NMax = 10000, points = 4001, f = 50):
+    T = 1 / f
+    omega = 2*np.pi*f
+    u = np.linspace (-1, 1, points)
+    t = T/2 * u**3
+    somme = SommeIncrementale (coefficientsCarre (2*NMax - 1), omega, t)
+    fig, (axeComplet, axeZoom) = plt.subplots (1, 2, figsize = (20, 10))
+    plt.subplots_adjust (bottom = 0.2)
+    courbes = {}
+    for nom, style in [("brute", '-'), ("Fejér", '--'), ("Lanczos", ':')]:
+        courbes[nom] = [axe.plot (t/T, somme.somme, style, linewidth = 3, label = nom, visible = nom == "brute")[0]
+            for axe in (axeComplet, axeZoom)]
+    for axe in (axeComplet, axeZoom):
+        axe.axhline (1, color = 'k', linewidth = 1)
+        axe.set_xlabel ("$t/ T$")
+        axe.set_ylabel ("$s$")
+    axeComplet.set_ylim (-1.3, 1.3)
+    axeComplet.legend (loc = 'lower right')
+    curseur = Slider (plt.axes ([0.15, 0.07, 0.5, 0.03]), 'N  ', 1, NMax, valinit = 1, valstep = 1)
+    options = CheckButtons (plt.axes ([0.75, 0.02, 0.15, 0.12]), ["Fejér", "Lanczos"], [False, False])
+    def miseAJour (val):
+        N = int (curseur.val)
+        courbe = somme.regle (2*N - 1)
+        actives = dict (zip (["Fejér", "Lanczos"], options.get_status ()))
+        valeurs = {"brute" : courbe,
+            "Fejér" : somme.fejer () if actives["Fejér"] else None,
+            "Lanczos" : somme.lanczos () if actives["Lanczos"] else None}
+        for nom, valeur in valeurs.items ():
+            for ligne in courbes[nom]:
+                ligne.set_visible (valeur is not None)
+                if valeur is not None:
+                    ligne.set_ydata (valeur)
+        amplitude, position = depassement (t, courbe)
+        axeComplet.set_title (f"N = {N} : dépassement {amplitude / 2:.2%} du saut en $t = {position / T:.2e} \\, T$", fontsize = 18)
+        # zoom sur les premières oscillations après la discontinuité
+        axeZoom.set_xlim (0, 5 / (2*N))
+        axeZoom.set_ylim (0.8, 1.25)
+        fig.canvas.draw_idle ()
+    curseur.on_changed (miseAJour)
+    options.on_clicked (miseAJour)
+    miseAJour (1)
+    return curseur, options
+
 # tracé de la série de Fourier
 f = 50
 T = 1 / f
 omega = 2*np.pi*f
-t = np.linspace (-T, T, 1000)
+M = 500
+t = -T + np.arange (2*M) * T / M
+# carreFourier (N) s'arrête à l'harmonique 2N - 1
+Ns = np.array ([1, 10, 100, 10000])
+sommes = sommesPartielles (coefficientsCarre (2*Ns.max () - 1), 2*Ns - 1, M, periodes=2)
 plt.figure (figsize = (20, 10))
-plt.plot (t/T, carreFourier (1, omega, t), linewidth = 5)
-plt.plot (t/T, carreFourier (10, omega, t), linewidth = 5)
-plt.plot (t/T, carreFourier (100, omega, t), linewidth = 5)
-plt.plot (t/T, carreFourier (10000, omega, t), linewidth = 5)
+for somme in sommes:
+    plt.plot (t/T, somme, linewidth = 5)
 plt.xlabel ("$t/ T$")
 plt.ylabel ("$s$")
 plt.title ("$s(t)$")
-plt.show ()
\ No newline at end of file
+plt.show ()
+
+# autres signaux : triangle, dent de scie et période échantillonnée
+autresSignaux = False
+if autresSignaux:
+    Ns = np.array ([1, 5, 50, 1000000])
+    periode = np.where (np.arange (M) < M / 4, 1.0, 0.0)
+    signaux = {"triangle" : coefficientsTriangle (Ns.max ()),
+        "dent de scie" : coefficientsDentDeScie (Ns.max ()),
+        "impulsion" : coefficientsEchantillons (periode, Ns.max ())}
+    for nom, coefficients in signaux.items ():
+        plt.figure (figsize = (20, 10))
+        for N, somme in zip (Ns, sommesPartielles (coefficients, Ns, M, periodes=2)):
+            plt.plot (t/T, somme, linewidth = 3, label = f"N = {N}")
+        plt.xlabel ("$t/ T$")
+        plt.ylabel ("$s$")
+        plt.title (f"$s(t)$ : {nom}")
+        plt.legend (loc = 'best')
+    plt.show ()
+
+# exploration interactive du phénomène de Gibbs
+explorateurGibbs = False
+if explorateurGibbs:
+    curseur, options = exploreGibbs ()
+    plt.show ()
@@ -6,6 +6,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from scipy.fft import dst
 
 # n : ordre
 # c : célérité
@@ -14,6 +15,103 @@ def modePropre (x, t, n, c, L):
     k = np.pi * n / L
     return np.cos (k * c * t) * np.sin (k * x)
 
+# superposition de modes y(x, t) = sum_n a_n cos(k_n c t) sin(k_n x) pour les
+# coefficients a_1, a_2, ... : les profils sin(k_n x) des modes non nuls sont
+# calculés une seule fois, chaque image est calculée à la demande
+class OndeStationnaire:
+    def __init__ (self, x, coefficients, c, L):
+        coefficients = np.atleast_1d (coefficients)
+        n = np.flatnonzero (coefficients) + 1
+        k = np.pi * n / L
+        self.amplitudes = coefficients[n - 1]
+        self.pulsations = k * c
+        self.profils = np.sin (k[:, None] * x[None, :])
+
+    def image (self, t):
+        return (self.amplitudes * np.cos (self.pulsations * t)) @ self.profils
+
+# conditions initiales : corde pincée en `position` (triangle de hauteur
+# `hauteur`) et corde frappée par un marteau de largeur `largeur` (vitesse
+# initiale gaussienne, forme initiale nulle)
+def cordePincee (x, L, position, hauteur):
+    return hauteur * np.where (x < position, x / position, (L - x) / (L - position))
+
+def cordeFrappee (x, position, largeur, vitesse):
+    return vitesse * np.exp (-((x - position) / largeur)**2 / 2)
+
+# corde fixée aux deux bouts, intégrée par saute-mouton
+#     y_tt + amortissement y_t = c(x)^2 y_xx,   c(x)^2 = c^2 / densite(x)
+# (densité relative à celle de célérité c) avec l'amortissement centré. Le
+# pas de temps vaut `courant` dx / max c(x) ; pour une corde homogène et
+# courant = 1 le schéma est exact aux points de la grille. Les formes initiales
+# peuvent être empilées (dernier axe = x), elles avancent ensemble
+class CordeDifferencesFinies:
+    def __init__ (self, L, c, n, amortissement=0, densite=None, courant=1):
+        self.x = np.linspace (0, L, n)
+        dx = self.x[1] - self.x[0]
+        self.c2 = c**2 / (np.ones (n) if densite is None else np.asarray (densite))
+        self.dt = courant * dx / np.sqrt (self.c2.max ())
+        self.amortissement = amortissement
+        self.facteur = (self.dt / dx)**2 * self.c2[1:-1]
+
+    # dt^2 c^2 y_xx aux points intérieurs
+    def laplacien (self, y):
+        return self.facteur * (y[..., 2:] - 2*y[..., 1:-1] + y[..., :-2])
+
+    # intègre sur pasDeTemps pas de temps et renvoie la forme de la corde tous
+    # les `decimation` pas (l'image 0 est la forme initiale)
+    def run (self, y0, v0, pasDeTemps, decimation=1):
+        y0, v0 = np.broadcast_arrays (np.asarray (y0, dtype=float), np.asarray (v0, dtype=float))
+        images = np.zeros ((pasDeTemps // decimation + 1,) + y0.shape)
+        images[0] = y0
+        gamma = self.amortissement * self.dt / 2
+        precedent = y0.copy ()
+        courant = y0.copy ()
+        courant[..., 1:-1] += self.dt * v0[..., 1:-1] * (1 - gamma) + self.laplacien (y0) / 2
+        if decimation == 1 and pasDeTemps >= 1:
+            images[1] = courant
+        for i in range (2, pasDeTemps + 1):
+            suivant = np.zeros_like (courant)
+            suivant[..., 1:-1] = (2*courant[..., 1:-1] - (1 - gamma) * precedent[..., 1:-1]
+                + self.laplacien (courant)) / (1 + gamma)
+            precedent, courant = courant, suivant
+            if i % decimation == 0:
+                images[i // decimation] = courant
+        return images
+
+# projection modale d'une corde homogène fixée aux deux bouts, sur la grille
+# régulière x : la DST-I de la forme et de la vitesse initiales donne les
+# coefficients a_n et b_n des modes sin(n pi x / L) (un par point intérieur,
+# les `nombreModes` premiers sont gardés). Avec l'amortissement chaque mode
+# évolue en exp(-amortissement t / 2) (a_n cos w'_n t + b'_n sin w'_n t / w'_n),
+# et chaque image est une seule DST-I des coefficients à l'instant t
+class CordeModale:
+    def __init__ (self, x, y0, v0, c, amortissement=0, nombreModes=None):
+        n = len (x)
+        modes = np.arange (1, n - 1)
+        self.x = x
+        y0 = np.broadcast_to (np.asarray (y0, dtype=float), x.shape)
+        v0 = np.broadcast_to (np.asarray (v0, dtype=float), x.shape)
+        self.a = dst (y0[1:-1], type=1) / (n - 1)
+        b = dst (v0[1:-1], type=1) / (n - 1)
+        if nombreModes is not None:
+            self.a[nombreModes:] = 0
+            b[nombreModes:] = 0
+        self.amortissement = amortissement
+        self.pulsations = np.sqrt ((np.pi * modes * c / (x[-1] - x[0]))**2 - amortissement**2 / 4 + 0j)
+        self.b = b + amortissement * self.a / 2
+
+    # coefficients des modes à l'instant t
+    def coefficients (self, t):
+        w = self.pulsations
+        oscillation = self.a * np.cos (w * t) + self.b * np.sin (w * t) / w
+        return np.exp (-self.amortissement * t / 2) * oscillation.real
+
+    def image (self, t):
+        y = np.zeros (len (self.x))
+        y[1:-1] = dst (self.coefficients (t), type=1) / 2
+        return y
+
 # propriété de l'onde
 c = 500
 L = 1
@@ -39,22 +137,44 @@ plt.axhline (y=0, color='black')
 """
 animation du troisieme mode
 """
-# calcul du mode
-t = 0
+# coefficients des modes (ici le troisième seul, [1, 0, 0.5] superposerait
+# les modes 1 et 3), chaque image est calculée au moment de l'afficher
 images = 1200
 tempsMax = 2/c
 dt = tempsMax / images
-onde = np.zeros ((images, len (x)))
-for i in range(images):
-    onde[i, :] = modePropre (x, t, 3, c, L)
-    t += dt
+onde = OndeStationnaire (x, [0, 0, 1], c, L)
 
 # animation
 line, = plt.plot ([], [], 'darkorange', label=r"$y_3 (x, t)$", linewidth=2)
 def animate (i):
-    line.set_data (x, onde[i, :])
+    line.set_data (x, onde.image (i * dt))
     return line,
 plt.legend (loc=3)
 anim = animation.FuncAnimation (fig, animate, frames=images, interval=1, blit=True, repeat=True)
 
-plt.show ()
\ No newline at end of file
+plt.show ()
+
+"""
+corde pincée : différences finies et projection modale
+"""
+corde = False
+if corde:
+    cordeFD = CordeDifferencesFinies (L, c, 1000, amortissement=20)
+    forme = cordePincee (cordeFD.x, L, 0.2*L, 1)
+    pasDeTemps = 2000
+    formes = cordeFD.run (forme, 0, pasDeTemps)
+    modale = CordeModale (cordeFD.x, forme, 0, c, amortissement=20)
+    fig = plt.figure ()
+    plt.xlabel ("$x / L$")
+    plt.ylabel ("$y(x, t) / y_{max}$")
+    plt.title ("Corde pincée")
+    plt.ylim (-1.1, 1.1)
+    ligneFD, = plt.plot (cordeFD.x / L, formes[0], linewidth=5, label="différences finies")
+    ligneModale, = plt.plot (cordeFD.x / L, forme, 'darkorange', linewidth=2, label="modes")
+    def animeCorde (i):
+        ligneFD.set_ydata (formes[i])
+        ligneModale.set_ydata (modale.image (i * cordeFD.dt))
+        return ligneFD, ligneModale
+    plt.legend (loc=3)
+    animCorde = animation.FuncAnimation (fig, animeCorde, frames=pasDeTemps + 1, interval=1, blit=True, repeat=True)
+    plt.show ()
@@ -4,15 +4,50 @@
 """
 
 import numpy as np
+import scipy.fft as fft
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.colors import LogNorm
 
 plt.rcParams.update({'font.size': 16})
 
 
-# sinus cardinal
+# sinus cardinal (np.sinc est le sinus cardinal normalisé, défini en 0)
 def sinc (x):
-    return np.sin (x) / x
+    return np.sinc (x / np.pi)
+
+# facteur d'interférence (sin N phi / N sin phi)^2, égal à 1 aux maxima
+# principaux sin phi = 0
+def facteurReseau (phi, N):
+    s = np.sin (phi)
+    nul = abs (s) < 1e-12
+    return np.where (nul, 1, (np.sin (N * phi) / (N * np.where (nul, 1, s)))**2)
+
+# intensité de N fentes de largeur a espacées de b, au foyer d'une lentille de
+# focale f, sommée sur le spectre (lambdas, poids), normalisée à 1 en X = 0 :
+#     I = sinc^2(pi a X / lambda f) (sin N phi / N sin phi)^2, phi = pi b X / lambda f
+# Le calcul est un seul tableau (lambda x X) par paquets d'au plus
+# `taillePaquet` éléments ; les poids peuvent être un vecteur (intensité
+# totale) ou une matrice (lambda x 3) pour obtenir les couleurs
+def intensiteFentes (X, a, b, N, focale, lambdas, poids=None, taillePaquet=2**22):
+    lambdas = np.atleast_1d (lambdas)
+    poids = np.ones (len (lambdas)) if poids is None else np.asarray (poids)
+    intensite = np.empty ((len (X),) + poids.shape[1:])
+    paquet = max (1, taillePaquet // len (lambdas))
+    for debut in range (0, len (X), paquet):
+        u = np.pi * X[None, debut:debut + paquet] / (lambdas[:, None] * focale)
+        intensite[debut:debut + paquet] = (sinc (a * u)**2 * facteurReseau (b * u, N)).T @ poids
+    return intensite / poids.sum (axis=0)
+
+# couleur (r, g, b) approchée d'une longueur d'onde visible (en m), linéaire
+# par morceaux et atténuée aux extrémités du spectre
+def couleurLongueurOnde (lambdas):
+    l = np.asarray (lambdas) * 1e9
+    r = np.interp (l, [380, 440, 490, 510, 580, 645, 780], [0.6, 0, 0, 0, 1, 1, 1])
+    g = np.interp (l, [380, 440, 490, 510, 580, 645, 780], [0, 0, 1, 1, 1, 0, 0])
+    b = np.interp (l, [380, 440, 490, 510, 580, 645, 780], [1, 1, 1, 0, 0, 0, 0])
+    attenuation = np.interp (l, [380, 420, 700, 780], [0.3, 1, 1, 0.3])
+    return np.column_stack ((r, g, b)) * attenuation[:, None]
 
 # trace les axes du diagrammes sinc
 def traceAxes (axes):
@@ -27,6 +62,74 @@ def traceAxes (axes):
     axes.set_xlabel("$x / x_0$", loc="right", fontsize=18)
 
 
+# coordonnées centrées (ligne x et colonne y) d'une grille N x N de pas `pixel`
+def grilleOuverture (N, pixel):
+    c = (np.arange (N) - (N - 1) / 2) * pixel
+    return c[None, :], c[:, None]
+
+# ouvertures usuelles, transmission 0 ou 1 sur une grille N x N
+def masqueRectangle (N, pixel, largeur, hauteur):
+    X, Y = grilleOuverture (N, pixel)
+    return ((abs (X) <= largeur / 2) & (abs (Y) <= hauteur / 2)).astype (np.float32)
+
+def masqueCercle (N, pixel, rayon):
+    X, Y = grilleOuverture (N, pixel)
+    return (X**2 + Y**2 <= rayon**2).astype (np.float32)
+
+# `nombre` fentes de largeur `largeur` espacées de `ecart`, le profil ne
+# dépend que de x : chaque point est comparé à la fente la plus proche
+def masqueFentes (N, pixel, nombre, largeur, ecart, hauteur=np.inf):
+    X, Y = grilleOuverture (N, pixel)
+    indice = np.clip (np.round (X / ecart + (nombre - 1) / 2), 0, nombre - 1)
+    fentes = abs (X - (indice - (nombre - 1) / 2) * ecart) <= largeur / 2
+    return (fentes & (abs (Y) <= hauteur / 2)).astype (np.float32)
+
+# réseau de pas `pas` remplissant toute la grille
+def masqueReseau (N, pixel, pas, largeur):
+    return masqueFentes (N, pixel, int (N * pixel // pas), largeur, pas)
+
+# ouverture lue dans une image (niveaux de gris normalisés, ramenée à N x N
+# par le plus proche voisin)
+def masqueImage (chemin, N):
+    image = plt.imread (chemin).astype (np.float32)
+    if image.ndim == 3:
+        image = image[..., :3].mean (axis=-1)
+    lignes = np.arange (N) * image.shape[0] // N
+    colonnes = np.arange (N) * image.shape[1] // N
+    image = image[lignes[:, None], colonnes[None, :]]
+    return image / max (image.max (), 1e-30)
+
+# figure de Fraunhofer |TF(masque)|^2 d'une ouverture quelconque par une FFT
+# 2D de taille `taille` x `taille`, le masque (de pas `pixel`) étant complété
+# par des zéros. Un tampon est conservé pour chaque taille (et les plans par
+# scipy.fft) : seule la zone du masque précédent est remise à zéro. Le masque
+# étant réel, seule la moitié du spectre est calculée (rfft2), l'autre moitié
+# s'en déduit par I(-u, -v) = I(u, v). L'écran est repéré en x / x0, avec
+# x0 = lambda f / largeur la première annulation d'une fente de cette largeur
+# (x / x0 = u largeur, u étant la fréquence spatiale)
+class Fraunhofer:
+    def __init__ (self):
+        self.tampons = {}
+        self.zonesEcrites = {}
+
+    def intensite (self, masque, pixel, taille, largeur):
+        if taille not in self.tampons:
+            self.tampons[taille] = np.zeros ((taille, taille), dtype=np.float32)
+        tampon = self.tampons[taille]
+        lignes, colonnes = self.zonesEcrites.get (taille, (0, 0))
+        tampon[:lignes, :colonnes] = 0
+        tampon[:masque.shape[0], :masque.shape[1]] = masque
+        self.zonesEcrites[taille] = masque.shape
+        spectre = fft.rfft2 (tampon, workers=-1)
+        demi = spectre.real**2 + spectre.imag**2
+        # colonnes de fréquences négatives par symétrie centrale
+        oppose = (-np.arange (taille)) % taille
+        image = np.concatenate ((demi, demi[np.ix_ (oppose, taille - np.arange (demi.shape[1], taille))]), axis=1)
+        image = fft.fftshift (image) / np.float32 (masque.sum ())**2
+        axe = fft.fftshift (fft.fftfreq (taille, pixel)) * largeur
+        return axe, image
+
+
 # paramètre oscillation
 a = 0.01
 f = 0.2
@@ -48,4 +151,51 @@ traceAxes (axes)
 axes.plot (x/9.4, (sinc (x))**2, linewidth = 5)
 plt.title ("Intensité")
 axes.set_ylabel("$I / I_0$", loc="top", fontsize=18)
-plt.show ()
\ No newline at end of file
+plt.show ()
+
+# réseau de N fentes en lumière blanche : intensité totale et couleurs,
+# comparées au réseau éclairé à la seule longueur d'onde lambd
+polychromatique = False
+if polychromatique:
+    N = 5
+    pas = 4*a
+    x0 = lambd * f / a
+    X = np.linspace (-3, 3, 10000) * x0
+    lambdas = np.linspace (400e-9, 750e-9, 1000)
+    blanc = intensiteFentes (X, a, pas, N, f, lambdas)
+    couleurs = intensiteFentes (X, a, pas, N, f, lambdas, couleurLongueurOnde (lambdas))
+    fig, (axes, axeCouleurs) = plt.subplots (2, 1, figsize = (16, 10), height_ratios = [4, 1], sharex = True)
+    axes.plot (X / x0, intensiteFentes (X, a, pas, N, f, lambd), linewidth = 2, label = f"$\\lambda$ = {lambd*1e9:.0f} nm")
+    axes.plot (X / x0, blanc, linewidth = 4, label = "lumière blanche")
+    axes.set_ylabel ("$I / I_0$", fontsize=18)
+    axes.set_title (f"Réseau de {N} fentes")
+    axes.legend (loc = 'upper right')
+    axeCouleurs.imshow ((couleurs / couleurs.max ())[None], aspect = 'auto', extent = (X[0] / x0, X[-1] / x0, 0, 1))
+    axeCouleurs.set_yticks ([])
+    axeCouleurs.set_xlabel ("$x / x_0$", fontsize=18)
+    plt.show ()
+
+# figures de diffraction 2D d'ouvertures quelconques (fente de largeur a
+# décrite par 64 pixels, grille complétée jusqu'à 4096 x 4096)
+diffraction2D = False
+if diffraction2D:
+    N = 512
+    pixel = a / 64
+    ouvertures = {"Rectangle" : masqueRectangle (N, pixel, a, 3*a),
+        "Cercle" : masqueCercle (N, pixel, a),
+        "Trois fentes" : masqueFentes (N, pixel, 3, a / 2, 2*a, 4*a),
+        "Réseau" : masqueReseau (N, pixel, a / 2, a / 8)}
+    fraunhofer = Fraunhofer ()
+    for titre, masque in ouvertures.items ():
+        axe, image = fraunhofer.intensite (masque, pixel, 4096, a)
+        fig, (axeMasque, axeImage) = plt.subplots (1, 2, figsize = (16, 8))
+        axeMasque.imshow (masque, cmap='gray', extent=np.array ([-1, 1, -1, 1]) * N * pixel / (2*a))
+        axeMasque.set_title (f"{titre} : ouverture")
+        axeMasque.set_xlabel ("$X / a$")
+        etendue = (axe[0], axe[-1], axe[0], axe[-1])
+        axeImage.imshow (image, cmap='inferno', extent=etendue, norm=LogNorm (vmin=1e-4, vmax=1), origin='lower')
+        axeImage.set_xlim (-5, 5)
+        axeImage.set_ylim (-5, 5)
+        axeImage.set_title ("$I / I_0$")
+        axeImage.set_xlabel ("$x / x_0$")
+    plt.show ()
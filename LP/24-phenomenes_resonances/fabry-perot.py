@@ -23,6 +23,99 @@ def transmission (R, d, theta, lambd):
     cos = np.cos (2 * d * k *np.cos (theta))
     return (1 - R)**2 / (1 + R**2 - 2*R*cos)
 
+# demi-largeur à mi-hauteur h des pics en déphasage : T = 1/2 pour
+# cos(delta) = 1 - (1 - R)^2 / 2R. En dessous de R = 3 - 2 sqrt(2) la
+# transmission ne descend jamais à 1/2, h est alors borné à pi
+def demiLargeurPhase (R):
+    return np.arccos (np.clip (1 - (1 - R)**2 / (2*R), -1, 1))
+
+# pics de transmission dans l'intervalle [lambdaMin, lambdaMax] : T = 1 pour
+# un déphasage delta = 2 d k cos(theta) = 2 pi m, soit lambda_m = 2 d cos(theta) / m,
+# la largeur à mi-hauteur est l'écart entre les longueurs d'onde de
+# delta = 2 pi m +- h et la finesse vaut pi / h. R, d et theta sont diffusés
+# entre eux, les pics sont rangés par longueur d'onde croissante selon un
+# dernier axe complété par des NaN
+def picsTransmission (R, d, theta, lambdaMin, lambdaMax):
+    R, d, theta = np.broadcast_arrays (np.asarray (R, dtype=float),
+        np.asarray (d, dtype=float), np.asarray (theta, dtype=float))
+    chemin = 2 * d * np.cos (theta)
+    mMin = np.maximum (np.ceil (chemin * vecteurOnde (lambdaMax) / (2*np.pi)), 1)
+    mMax = np.floor (chemin * vecteurOnde (lambdaMin) / (2*np.pi))
+    nombre = int (max (np.max (mMax - mMin + 1, initial=0), 0))
+    # ordres décroissants : longueurs d'onde croissantes
+    m = mMax[..., None] - np.arange (nombre)
+    valides = m >= mMin[..., None]
+    h = demiLargeurPhase (R)
+    ecart = h[..., None] / (2*np.pi)
+    positions = np.where (valides, chemin[..., None] / m, np.nan)
+    largeurs = np.where (valides, chemin[..., None] / (m - ecart) - chemin[..., None] / (m + ecart), np.nan)
+    return positions, largeurs, np.pi / h
+
+# le doublet lambda1, lambda2 est résolu si ses raies sont séparées de plus
+# d'une largeur à mi-hauteur, sans dépasser l'intervalle spectral libre
+# lambda / m (sinon deux ordres voisins se chevauchent)
+def resoutDoublet (R, d, theta, lambda1, lambda2):
+    lambdaMoyen = (lambda1 + lambda2) / 2
+    ordre = 2 * d * np.cos (theta) / lambdaMoyen
+    largeur = lambdaMoyen * demiLargeurPhase (R) / (np.pi * ordre)
+    ecart = abs (lambda2 - lambda1)
+    return (largeur < ecart) & (ecart < lambdaMoyen / ordre)
+
+# spectre de raies de profil gaussien (largeurs à mi-hauteur), échantillonnées
+# sur `points` longueurs d'onde chacune : longueurs d'onde et poids normalisés
+def spectreRaies (centres, poids, largeurs, points=1):
+    profil = np.linspace (-2, 2, points) if points > 1 else np.zeros (1)
+    centres, poids, largeurs = np.broadcast_arrays (np.asarray (centres, dtype=float),
+        np.asarray (poids, dtype=float), np.asarray (largeurs, dtype=float))
+    lambdas = centres[:, None] + largeurs[:, None] / 2.355 * profil[None, :]
+    intensites = poids[:, None] * np.exp (-profil[None, :]**2 / 2)
+    return lambdas.ravel (), (intensites / intensites.sum ()).ravel ()
+
+# figure d'anneaux T(x, y) dans le plan focal d'une lentille de focale
+# `focale`, sur une image hauteur x largeur de pixels de côté `pixel`
+# (tan theta = rho / focale), sommée sur le spectre (lambdas, poids). La
+# figure est symétrique : seul le quart x, y >= 0 est calculé puis recopié.
+# Les lignes et les longueurs d'onde sont prises par paquets d'au plus
+# `taillePaquet` éléments, seule l'image (float32) a la taille totale
+def figureAnneaux (R, d, focale, largeur, hauteur, pixel, lambdas, poids=None, taillePaquet=2**22):
+    lambdas = np.atleast_1d (lambdas)
+    poids = np.full (len (lambdas), 1 / len (lambdas)) if poids is None else np.asarray (poids)
+    x = (np.arange (largeur) - (largeur - 1) / 2)[largeur // 2:] * pixel
+    y = (np.arange (hauteur) - (hauteur - 1) / 2)[hauteur // 2:] * pixel
+    quart = np.zeros ((len (y), len (x)), dtype=np.float32)
+    paquetLambda = min (len (lambdas), max (1, taillePaquet // len (x)))
+    paquetLignes = max (1, taillePaquet // (len (x) * paquetLambda))
+    for debut in range (0, len (y), paquetLignes):
+        rho = np.hypot (x[None, :], y[debut:debut + paquetLignes, None])
+        theta = np.arctan (rho / focale)[..., None]
+        for i in range (0, len (lambdas), paquetLambda):
+            T = transmission (R, d, theta, lambdas[i:i + paquetLambda])
+            quart[debut:debut + paquetLignes] += T @ poids[i:i + paquetLambda]
+    # recopie des trois autres quarts
+    demi = np.concatenate ((quart[:, ::-1][:, :largeur - len (x)], quart), axis=1)
+    return np.concatenate ((demi[::-1][:hauteur - len (y)], demi), axis=0)
+
+# contraste (Imax - Imin) / (Imax + Imin) de l'image et finesse mesurée sur le
+# profil de la ligne centrale : aux petits angles les anneaux sont
+# équidistants en rho^2, la finesse est le rapport médian entre l'écart de
+# deux anneaux successifs et leur largeur à mi-hauteur, en rho^2
+def analyseAnneaux (image, pixel):
+    contraste = (image.max () - image.min ()) / (image.max () + image.min ())
+    ligne = image[image.shape[0] // 2, image.shape[1] // 2:].astype (float)
+    rho2 = ((np.arange (len (ligne)) + (image.shape[1] + 1) % 2 / 2) * pixel)**2
+    pics = np.flatnonzero ((ligne[1:-1] > ligne[:-2]) & (ligne[1:-1] >= ligne[2:])) + 1
+    largeurs = []
+    for gauche, pic, droite in zip (pics[:-2], pics[1:-1], pics[2:]):
+        niveau = (ligne[pic] + ligne[gauche:droite].min ()) / 2
+        a = gauche + np.argmin (ligne[gauche:pic])
+        b = pic + np.argmin (ligne[pic:droite])
+        # interpolation des deux passages à mi-hauteur de part et d'autre du pic
+        montee = np.interp (niveau, ligne[a:pic + 1], rho2[a:pic + 1])
+        descente = np.interp (niveau, ligne[pic:b + 1][::-1], rho2[pic:b + 1][::-1])
+        largeurs.append ((descente - montee, (rho2[droite] - rho2[gauche]) / 2))
+    finesse = np.median ([ecart / largeurMiHauteur for largeurMiHauteur, ecart in largeurs]) if largeurs else np.nan
+    return contraste, finesse
+
 
 ## cavité de taille variable
 # paramètres de l'onde
@@ -44,7 +137,42 @@ plt.show ()
 lOndes = np.linspace (5895.924, 5889.950, 10000)
 plt.figure (figsize = (20, 10))
 plt.plot (lOndes, transmission (0.9, 1e-3, 0, lOndes/10**10), linewidth=5)
+# pics calculés directement
+pics, largeurs, finesse = picsTransmission (0.9, 1e-3, 0, 5889.950e-10, 5895.924e-10)
+plt.plot (pics*10**10, transmission (0.9, 1e-3, 0, pics), 'o', markersize=15)
 plt.xlabel ("$\lambda$ [nm]")
 plt.ylabel ("Transmission $T_{FP}$")
 plt.title ("$T_{FP}$ en fonction de $\lambda$")
-plt.show ()
\ No newline at end of file
+plt.show ()
+
+## résolution du doublet du sodium en fonction de R et d
+doublet = False
+if doublet:
+    R = np.linspace (0.5, 0.99, 500)[:, None]
+    d = np.geomspace (1e-5, 1e-3, 500)[None, :]
+    resolu = resoutDoublet (R, d, 0, 5889.950e-10, 5895.924e-10)
+    plt.figure (figsize = (20, 10))
+    plt.pcolormesh (d[0]*1e3, R[:, 0], resolu, cmap='Greens', shading='auto')
+    plt.xscale ('log')
+    plt.xlabel ("$d$ [mm]")
+    plt.ylabel ("$R$")
+    plt.title ("Doublet du sodium résolu")
+    plt.show ()
+
+## figure d'anneaux à travers une lentille
+anneaux = False
+if anneaux:
+    # doublet du sodium, chaque raie élargie sur 50 longueurs d'onde
+    lambdas, poids = spectreRaies ([5889.950e-10, 5895.924e-10], [2, 1], 0.05e-10, 50)
+    # les anneaux doivent couvrir plusieurs pixels pour mesurer la finesse
+    pixel = 1e-5
+    for R in [0.8, 0.9]:
+        image = figureAnneaux (R, 1e-3, 0.2, 2048, 2048, pixel, lambdas, poids)
+        contraste, finesse = analyseAnneaux (image, pixel)
+        plt.figure (figsize = (12, 12))
+        plt.imshow (image, cmap='inferno', extent=np.array ([-1, 1, -1, 1]) * 1024 * pixel * 1e3)
+        plt.xlabel ("$x$ [mm]")
+        plt.ylabel ("$y$ [mm]")
+        plt.title (f"R = {R} : contraste {contraste:.2f}, finesse apparente {finesse:.1f} " + \
+            f"(théorique {np.pi * np.sqrt (R) / (1 - R):.1f})")
+    plt.show ()
@@ -23,15 +23,107 @@ def Hx (omega, omega0, Q):
     den = (omega/omega0)**2 + Q**2 * (1 - (omega/omega0)**2)**2
     return Q / (omega0**2 * np.sqrt (den))
 
+# échantillonnage adaptatif commun à toutes les valeurs de Q : la grille
+# initiale est resserrée autour de omega0 sur la largeur omega0 / 2Q de chaque
+# pic (répartition lorentzienne omega0 (1 + tan(theta) / 2Q)), puis les
+# intervalles où l'interpolation linéaire s'écarte de H au milieu de plus de
+# `tolerance` sont coupés en deux (en log-log si logarithmique, sinon en
+# relatif au maximum de chaque courbe). Toutes les courbes sont évaluées d'un
+# coup, sous forme d'un tableau H[Q, omega]. La grille ne dépasse jamais
+# pointsMax points : la grille initiale est réduite si nécessaire
+def echantillonneAdaptatif (H, omega0, Q, omegaMin, omegaMax, points=200, tolerance=1e-3,
+        logarithmique=True, iterations=30, pointsMax=5000):
+    Q = np.asarray (Q, dtype=float)[:, None]
+    points = max (min (points, pointsMax // (len (Q) + 1)), 2)
+    base = np.geomspace (omegaMin, omegaMax, points) if logarithmique else np.linspace (omegaMin, omegaMax, points)
+    angles = np.linspace (-np.pi/2, np.pi/2, points + 2)[1:-1]
+    pics = omega0 * (1 + np.tan (angles) / (2*Q))
+    omega = np.unique (np.concatenate ((base, pics.ravel ())))
+    omega = omega[(omega >= omegaMin) & (omega <= omegaMax)]
+    if len (omega) > pointsMax:
+        omega = omega[np.round (np.linspace (0, len (omega) - 1, pointsMax)).astype (int)]
+    valeurs = H (omega[None, :], omega0, Q)
+    for i in range (iterations):
+        if logarithmique:
+            milieux = np.sqrt (omega[1:] * omega[:-1])
+            valeursMilieux = H (milieux[None, :], omega0, Q)
+            erreur = abs (np.log (valeursMilieux) - (np.log (valeurs[:, 1:]) + np.log (valeurs[:, :-1])) / 2)
+        else:
+            milieux = (omega[1:] + omega[:-1]) / 2
+            valeursMilieux = H (milieux[None, :], omega0, Q)
+            erreur = abs (valeursMilieux - (valeurs[:, 1:] + valeurs[:, :-1]) / 2) / valeurs.max (axis=1, keepdims=True)
+        erreur = erreur.max (axis=0)
+        # les intervalles les plus mauvais d'abord si le budget est atteint
+        affines = np.flatnonzero (erreur > tolerance)
+        affines = affines[np.argsort (erreur[affines])[::-1][:max (pointsMax - len (omega), 0)]]
+        if len (affines) == 0:
+            break
+        omega = np.concatenate ((omega, milieux[affines]))
+        valeurs = np.concatenate ((valeurs, valeursMilieux[:, affines]), axis=1)
+        ordre = np.argsort (omega)
+        omega, valeurs = omega[ordre], valeurs[:, ordre]
+    return omega, valeurs
+
+# oscillateur amorti forcé x'' + (omega0 / Q) x' + omega0^2 x = cos(omega t),
+# intégré pour tous les couples (Q, omega) diffusés à la fois : l'état est un
+# seul vecteur [x_1, v_1, x_2, v_2, ...], les équations étant découplées le
+# jacobien est tridiagonal (ml = mu = 1). Renvoie x et v de forme
+# (couples..., len(t))
+def oscillateurForce (omega0, Q, omega, t, x0=0, v0=0):
+    Q, omega = np.broadcast_arrays (np.asarray (Q, dtype=float), np.asarray (omega, dtype=float))
+    forme = Q.shape
+    Q, omega = Q.ravel (), omega.ravel ()
+    def derivee (etat, temps):
+        x, v = etat[0::2], etat[1::2]
+        return np.column_stack ((v, np.cos (omega * temps) - omega0 / Q * v - omega0**2 * x)).ravel ()
+    etat0 = np.column_stack ((np.broadcast_to (x0, Q.shape), np.broadcast_to (v0, Q.shape))).ravel ()
+    solution = odeint (derivee, etat0, t, ml=1, mu=1, rtol=1e-9, atol=1e-12)
+    x = solution[:, 0::2].T.reshape (forme + (len (t),))
+    v = solution[:, 1::2].T.reshape (forme + (len (t),))
+    return x, v
+
+# régime permanent x = A cos(omega t + phi), ajusté aux moindres carrés sur les
+# périodes d'excitation entières contenues dans la dernière `fraction` de
+# l'intégration (au moins une), et durée de vie tau du
+# transitoire : l'énergie E = v_t^2 + omega0^2 x_t^2 de l'écart au régime
+# permanent décroît comme exp(-2t / tau), tau est tiré d'une régression
+# linéaire de log E (limitée aux instants où E dépasse `seuil` fois son maximum).
+# tau vaut 2Q / omega0 pour Q >= 1/2 ; pour Q < 1/2 (régime apériodique) le
+# mode lent domine et tau = 1 / (omega0 (1/2Q - sqrt(1/4Q^2 - 1)))
+def analyseRegime (t, x, v, omega0, omega, fraction=0.5, seuil=1e-10):
+    omega = np.asarray (omega, dtype=float)[..., None] * np.ones (x.shape[:-1] + (1,))
+    C, S = np.cos (omega * t), np.sin (omega * t)
+    periodes = np.maximum (np.floor (fraction * (t[-1] - t[0]) * omega / (2*np.pi)), 1)
+    fenetre = t > t[-1] - periodes * 2*np.pi / omega
+    Scc, Sss, Scs = (fenetre * C * C).sum (-1), (fenetre * S * S).sum (-1), (fenetre * C * S).sum (-1)
+    Sxc, Sxs = (fenetre * x * C).sum (-1), (fenetre * x * S).sum (-1)
+    determinant = Scc * Sss - Scs**2
+    a = (Sss * Sxc - Scs * Sxs) / determinant
+    b = (Scc * Sxs - Scs * Sxc) / determinant
+    amplitude = np.hypot (a, b)
+    phase = np.arctan2 (-b, a)
+    # écart au régime permanent
+    xt = x - (a[..., None] * C + b[..., None] * S)
+    vt = v - omega * (b[..., None] * C - a[..., None] * S)
+    energie = vt**2 + omega0**2 * xt**2
+    utiles = energie > seuil * energie.max (axis=-1, keepdims=True)
+    logE = np.log (np.maximum (energie, 1e-300))
+    n = utiles.sum (-1)
+    tMoyen = (utiles * t).sum (-1) / n
+    logMoyen = (utiles * logE).sum (-1) / n
+    pente = (utiles * (t - tMoyen[..., None]) * (logE - logMoyen[..., None])).sum (-1) \
+        / (utiles * (t - tMoyen[..., None])**2).sum (-1)
+    return amplitude, phase, -2 / pente
+
 ## paramètre resonance
 Q = [0.3, 0.7, 1, 2, 4]
 omega0 = 1
-omega = np.linspace (0, 5, 100000)
 
 # tracé de H_x
+omega, valeurs = echantillonneAdaptatif (Hx, omega0, Q, 1e-3, 5, logarithmique=False)
 plt.figure (figsize = (20, 10))
-for q in Q:
-    plt.plot (omega, Hx (omega, omega0, q), linewidth=5)
+for courbe in valeurs:
+    plt.plot (omega, courbe, linewidth=5)
 plt.axvline (x=omega0, color='red', linestyle='--', linewidth=4)
 plt.legend (['Q = 0.3', 'Q = 0.7', 'Q = 1', 'Q = 2', 'Q = 4'], loc=1)
 plt.xlabel ("$\omega / \omega_0$")
@@ -40,12 +132,63 @@ plt.title ("$H_x (\omega)$")
 plt.show ()
 
 # tracé de H_v
+omega, valeurs = echantillonneAdaptatif (Hv, omega0, Q, 1e-3, 5, logarithmique=False)
 plt.figure (figsize = (20, 10))
-for q in Q:
-    plt.plot (omega, Hv (omega, omega0, q), linewidth=5)
+for courbe in valeurs:
+    plt.plot (omega, courbe, linewidth=5)
 plt.axvline (x=omega0, color='red', linestyle='--', linewidth=4)
 plt.legend (['Q = 0.3', 'Q = 0.7', 'Q = 1', 'Q = 2', 'Q = 4'], loc=1)
 plt.xlabel ("$\omega / \omega_0$")
 plt.ylabel ("$H_v$ [$s$]")
 plt.title ("$H_v (\omega)$")
-plt.show ()
\ No newline at end of file
+plt.show ()
+
+# diagrammes de Bode jusqu'à des facteurs de qualité élevés
+bode = False
+if bode:
+    QBode = [0.3, 1, 10, 100, 1e4]
+    for H, nom in [(Hx, "H_x"), (Hv, "H_v")]:
+        omega, valeurs = echantillonneAdaptatif (H, omega0, QBode, 1e-2, 1e2)
+        plt.figure (figsize = (20, 10))
+        for q, courbe in zip (QBode, valeurs):
+            plt.loglog (omega, courbe, linewidth=3, label=f"Q = {q:g}")
+        plt.axvline (x=omega0, color='red', linestyle='--', linewidth=2)
+        plt.legend (loc=1)
+        plt.xlabel ("$\\omega / \\omega_0$")
+        plt.ylabel (f"${nom}$")
+        plt.title (f"Diagramme de Bode de ${nom}$ ({len (omega)} points)")
+    plt.show ()
+
+# vérification temporelle : tous les oscillateurs sont intégrés ensemble,
+# l'amplitude du régime permanent est comparée à H_x et H_v = omega H_x
+simulation = False
+if simulation:
+    omegaSimulation = np.linspace (0.2, 3, 40)
+    t = np.linspace (0, 150, 15001)
+    x, v = oscillateurForce (omega0, np.array (Q)[:, None], omegaSimulation[None, :], t)
+    amplitude, phase, tau = analyseRegime (t, x, v, omega0, omegaSimulation[None, :])
+    omega = np.linspace (1e-3, 5, 2000)
+    for H, mesure, nom in [(Hx, amplitude, "H_x"), (Hv, omegaSimulation * amplitude, "H_v")]:
+        plt.figure (figsize = (20, 10))
+        for q, valeurs in zip (Q, mesure):
+            courbe, = plt.plot (omega, H (omega, omega0, q), linewidth=3, label=f"Q = {q}")
+            plt.plot (omegaSimulation, valeurs, 'o', color=courbe.get_color (), markersize=8)
+        plt.legend (loc=1)
+        plt.xlabel ("$\\omega / \\omega_0$")
+        plt.ylabel (f"${nom}$")
+        plt.title (f"${nom} (\\omega)$ : régime permanent simulé")
+    # animation du régime transitoire : chaque point est un oscillateur de
+    # pulsation omega, l'enveloppe tend vers H_x
+    q = Q[-1]
+    fig = plt.figure (figsize = (20, 10))
+    plt.plot (omegaSimulation, Hx (omegaSimulation, omega0, q), 'r--', linewidth=2)
+    plt.plot (omegaSimulation, -Hx (omegaSimulation, omega0, q), 'r--', linewidth=2)
+    points, = plt.plot (omegaSimulation, x[-1, :, 0], 'o', markersize=10)
+    plt.xlabel ("$\\omega / \\omega_0$")
+    plt.ylabel ("$x$")
+    plt.title (f"Régime transitoire, Q = {q}, $\\tau = {np.median (tau[-1]):.1f}$ s")
+    def animate (i):
+        points.set_ydata (x[-1, :, 10*i])
+        return points,
+    anim = animation.FuncAnimation (fig, animate, frames=len (t) // 10, interval=16, blit=True)
+    plt.show ()
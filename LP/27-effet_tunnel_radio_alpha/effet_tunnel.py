@@ -4,40 +4,19 @@
   Résout l'équation de schrodinger avec une barrière de potentiel
 """
 
+import os
+import tempfile
 import numpy as np
-import scipy.sparse as sp
-import scipy.sparse.linalg
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+from schrodinger_1d import paquetOndeIncident, barriere, potentielAbsorbant, Simulation1D
+from trace_schrodinger_1d import traceBarriere, animeImages, animeInstants
 
-# paquet d'onde incident non normalisé
-def paquetOndeIncident (x, xCentre, largeur, k):
-    paquet = np.exp (- (x - xCentre)**2 / (2*largeur**2))
-    propagation = np.exp (1j * k * x)
-    return paquet * propagation
-
-# barrière de potentiel "carrée"
-def barriere (x, xCentre, largeur, amplitude):
-    carree = np.exp (-np.power ((x - xCentre) / largeur, 128))
-    return amplitude * carree
-
-# operateur d'évolution
-def operateurEvolution (I, H, dt):
-    return (I - 1j*dt/2 * H)
-
-# trace la barrière
-def traceBarriere (V, V0):
-    plt.title ("Propagation d'un paquet d'onde gaussien")
-    plt.plot (x, V / V0, label='$V(x)$')
-    plt.xlabel ("$x$ [unité arbitraire]")
-    plt.ylabel ("$V(x) / V_0$")
 
 """
 Initialisation
 """
 # paramètres spatiaux
 n = 1000
-dx = 1/n
 xMax = 0.5
 x = np.linspace (-xMax, xMax, n)
 
@@ -45,6 +24,9 @@ x = np.linspace (-xMax, xMax, n)
 dt = 1e-5
 T = 0.004
 pasDeTemps = int (T / dt)
+# moteur d'intégration : 'crank-nicolson', 'fourier' ou 'propre' (chaque
+# image est alors calculée à la demande, sans couche absorbante)
+moteur = 'crank-nicolson'
 
 # définition de la barrière
 V0 = 4.55e5
@@ -52,46 +34,61 @@ centreV = 0.0
 largeurV = 0.02
 potentiel = barriere (x, centreV, largeurV, V0)
 fig = plt.figure ()
-traceBarriere (potentiel, V0)
+traceBarriere (x, potentiel, V0, "Propagation d'un paquet d'onde gaussien")
 
-# définition de l'hamiltonien
-Ec = (-1 / (2 * dx**2)) * sp.diags ([1, -2, 1], [-1, 0, 1], shape=(n, n))
-V = sp.diags (potentiel, 0, shape=(n, n))
-H = Ec + V
+# couches absorbantes aux bords : l'onde sortante n'est pas réfléchie, ce
+# qui permet de réduire xMax et n
+absorption = False
+epaisseurAbsorbante = 0.1
+amplitudeAbsorbante = 3e5
+if absorption:
+    potentiel = potentiel + potentielAbsorbant (x, epaisseurAbsorbante, amplitudeAbsorbante)
+
+# définition de la simulation
+simulation = Simulation1D (x, potentiel, dt, moteur)
 
 # onde initiale
 k = 1e3
 x0 = -0.2
 largeur = 0.05
 onde = paquetOndeIncident (x, x0, largeur, k)
-# norme de l'onde
-normeOnde = np.zeros ((pasDeTemps, len (onde)))
-normeOnde[0,:] = abs (onde)**2
+# enregistrement de |psi|^2 : une image tous les `decimation` pas de temps,
+# projetée dans un fichier .npy du dossier temporaire pour que la mémoire
+# reste constante quelle que soit la durée (None pour tout garder en mémoire)
+fichierImages = os.path.join (tempfile.gettempdir (), 'normeOnde.npy')
+decimation = 1
 plt.ylim (-0.1, 2)
 
 
 """
-Intégration temporelle
+Intégration temporelle et animation de la solution
 """
-# résolution de schrodinger en demi-temps pour préserver la norme
-#     psi(x, t) = U(t) psi(x, 0)
-# <=> U(-t/2) psi(x, t) = U(t/2) psi(x, 0)
-#  => (1 + iH dt/2) psi(x, t) = (1 - iH dt/2) psi(x, 0)   si dt << 1
-I =  sp.diags ([1], 0, shape=(n, n))
-for i in range (pasDeTemps):
-    # sp.linalg.spsolve (A, B) résout Ax = B
-    onde = sp.linalg.spsolve (
-        operateurEvolution (I, H, -dt),
-        operateurEvolution (I, H, dt)*onde)
-    normeOnde[i, :] = abs (onde)**2
+if moteur == 'propre':
+    anim, curseur = animeInstants (fig, x, simulation.propagateur (onde), T, decimation*dt)
+else:
+    normeOnde = simulation.run (onde, pasDeTemps, decimation, fichierImages)
+    anim = animeImages (fig, x, normeOnde)
 
 
-# animation de la solution
-line, = plt.plot ([], [], 'darkorange', label=r"$|\psi (x, t)|^2$")
-def animate (i):
-    line.set_data (x, normeOnde[i, :])
-    return line,
-plt.legend (loc='best')
-anim = animation.FuncAnimation(fig, animate, frames=pasDeTemps, interval=10, blit=True, repeat=True)
+"""
+Balayage en énergie
+"""
+# paramètres du balayage : le paquet est relevé à mi-chemin entre la
+# barrière et le bord du domaine
+balayage = False
+ks = np.linspace (300, 1500, 100)
+distance = (centreV - x0) + (xMax - centreV) / 2
+# coefficient de transmission T(E) pour plusieurs barrières
+if balayage:
+    plt.figure ()
+    for hauteur, epaisseur in [(0.5*V0, largeurV), (V0, largeurV), (V0, 2*largeurV)]:
+        simulationBarriere = Simulation1D (x, barriere (x, centreV, epaisseur, hauteur), dt)
+        transmis = simulationBarriere.balayageTransmission (x0, largeur, ks, centreV, distance)
+        plt.plot (ks**2 / 2 / V0, transmis,
+            label=f"$V = {hauteur/V0} V_0, a = {epaisseur}$")
+    plt.title ("Coefficient de transmission")
+    plt.xlabel ("$E / V_0$")
+    plt.ylabel ("$T(E)$")
+    plt.legend (loc='best')
 
 plt.show()
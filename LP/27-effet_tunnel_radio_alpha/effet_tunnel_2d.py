@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+  Résout l'équation de schrodinger à deux dimensions : paquet d'onde
+  gaussien sur une paroi percée de fentes (ou une barrière pleine)
+"""
+
+import os
+import tempfile
+import numpy as np
+import matplotlib.pyplot as plt
+from schrodinger_2d import (paquetOndeIncident2D, paroiFentes,
+    potentielAbsorbant2D, Simulation2D)
+from trace_schrodinger_2d import traceObstacles, animeImages2D
+
+
+"""
+Initialisation
+"""
+# paramètres spatiaux
+n = 512
+xMax = 0.5
+x = np.linspace (-xMax, xMax, n)
+y = np.linspace (-xMax, xMax, n)
+X, Y = np.meshgrid (x, y)
+
+# paramètres temporels
+dt = 1e-5
+T = 0.002
+pasDeTemps = int (T / dt)
+
+# paroi à deux fentes (nombre = 0 : barrière pleine, effet tunnel si elle
+# est assez fine)
+k = 250
+V0 = 2 * k**2 / 2
+epaisseurV = 0.02
+nombreFentes = 2
+largeurFente = 0.04
+ecartFentes = 0.15
+potentiel = paroiFentes (X, Y, 0.0, epaisseurV, nombreFentes, largeurFente, ecartFentes, V0)
+# couches absorbantes aux bords
+potentiel = potentiel + potentielAbsorbant2D (x, y, 0.08, 1e5)
+
+# onde initiale
+x0 = -0.25
+largeur = 0.08
+onde = paquetOndeIncident2D (X, Y, x0, 0.0, largeur, k)
+# enregistrement de |psi|^2 : une image tous les `decimation` pas de temps,
+# projetée dans un fichier .npy du dossier temporaire (environ 100 Mo ici)
+# plutôt qu'à côté des sources
+fichierImages = os.path.join (tempfile.gettempdir (), 'densite2D.npy')
+decimation = 2
+
+
+"""
+Intégration temporelle et animation de la solution
+"""
+simulation = Simulation2D (x, y, potentiel, dt)
+densite = simulation.run (onde, pasDeTemps, decimation, fichierImages)
+
+fig = plt.figure ()
+plt.title ("Propagation d'un paquet d'onde gaussien à travers des fentes")
+anim = animeImages2D (fig, x, y, densite)
+traceObstacles (x, y, potentiel)
+
+plt.show()
@@ -4,40 +4,13 @@
   Résout l'équation de schrodinger avec une barrière de potentiel
 """
 
+import os
+import tempfile
 import numpy as np
-import scipy.sparse as sp
-import scipy.sparse.linalg
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-
-# paquet d'onde incident non normalisé
-def paquetOndeIncident (x, xCentre, largeur, k):
-    paquet = np.exp (- (x - xCentre)**2 / (2*largeur**2))
-    propagation = np.exp (1j * k * x)
-    return paquet * propagation
-
-# barrière de potentiel "carrée"
-def barriere (x, xCentre, largeur, amplitude):
-    carree = np.exp (-np.power ((x - xCentre) / largeur, 128))
-    return amplitude * carree
-
-# barrière gamow
-def barriereGamow (x, xCentre, amplitude):
-    coulomb = (1 + np.sign (x - xCentre)) / x**2
-    forte = 10 * (1 - np.sign (x - xCentre))
-    return amplitude * (coulomb - forte)
-
-# operateur d'évolution
-def operateurEvolution (I, H, dt):
-    return (I - 1j*dt/2. * H)
-
-# trace la barrière
-def traceBarriere (V, V0):
-    VMax = np.max (V)
-    plt.title ("Propagation d'un paquet d'onde gaussien dans un potentiel de Gamow")
-    plt.plot (x, V / V0 / 10, label='$V(x)$')
-    plt.xlabel ("$x$ [unité arbitraire]")
-    plt.ylabel ("$V(x) / V_0$")
+from schrodinger_1d import paquetOndeIncident, barriereGamow, potentielAbsorbant, Simulation1D
+from trace_schrodinger_1d import traceBarriere, animeImages, animeInstants
+from wkb import TableWKB, demiVie, verifieWKB
 
 
 """
@@ -45,7 +18,6 @@ Initialisation
 """
 # paramètres spatiaux
 n = 1000
-dx = 1/n
 xMax = 0.5
 x = np.linspace (0.01, 2*xMax, n)
 
@@ -53,50 +25,107 @@ x = np.linspace (0.01, 2*xMax, n)
 dt = 1e-5
 T = 0.004
 pasDeTemps = int (T / dt)
+# moteur d'intégration : 'crank-nicolson', 'fourier' ou 'propre' (chaque
+# image est alors calculée à la demande, sans couche absorbante)
+moteur = 'crank-nicolson'
 
 # définition de la barrière
 V0 = 1.1e4
 centreV = 0.3
 potentiel = barriereGamow (x, centreV, V0)
 fig = plt.figure ()
-traceBarriere (potentiel, V0)
+traceBarriere (x, potentiel, V0,
+    "Propagation d'un paquet d'onde gaussien dans un potentiel de Gamow", 10)
+
+# couche absorbante au bord droit (le bord gauche est le noyau) : l'onde
+# sortante n'est pas réfléchie, ce qui permet de réduire xMax et n
+absorption = False
+epaisseurAbsorbante = 0.1
+amplitudeAbsorbante = 3e5
+if absorption:
+    potentiel = potentiel + potentielAbsorbant (
+        x, epaisseurAbsorbante, amplitudeAbsorbante, gauche=False)
 
-# définition de l'hamiltonien
-Ec = (-1 / (2 * dx**2)) * sp.diags ([1, -2, 1], [-1, 0, 1], shape=(n, n))
-V = sp.diags (potentiel, 0, shape=(n, n))
-H = Ec + V
+# définition de la simulation
+simulation = Simulation1D (x, potentiel, dt, moteur)
 
 # onde initiale
 k = 1e3
 x0 = 0.1
 largeur = 0.05
 onde = paquetOndeIncident (x, x0, largeur, k)
-# norme de l'onde
-normeOnde = np.zeros ((pasDeTemps, len (onde)))
-normeOnde[0,:] = abs (onde)**2
+# enregistrement de |psi|^2 : une image tous les `decimation` pas de temps,
+# projetée dans un fichier .npy du dossier temporaire pour que la mémoire
+# reste constante quelle que soit la durée (None pour tout garder en mémoire)
+fichierImages = os.path.join (tempfile.gettempdir (), 'normeOndeGamow.npy')
+decimation = 1
 
 
 """
-Intégration temporelle
+Intégration temporelle et animation de la solution
 """
-# résolution de schrodinger en demi-temps pour préserver la norme
-#     psi(x, t) = U(t) psi(x, 0)
-# <=> U(-t/2) psi(x, t) = U(t/2) psi(x, 0)
-#  => (1 + iH dt/2) psi(x, t) = (1 - iH dt/2) psi(x, 0)   si dt << 1
-I =  sp.diags ([1], 0, shape=(n, n))
-for i in range (pasDeTemps):
-    # sp.linalg.spsolve (A, B) résout Ax = B
-    onde = sp.linalg.spsolve (
-        operateurEvolution (I, H, -dt),
-        operateurEvolution (I, H, dt)*onde)
-    normeOnde[i, :] = abs (onde)**2
+if moteur == 'propre':
+    anim, curseur = animeInstants (fig, x, simulation.propagateur (onde), T, decimation*dt)
+else:
+    normeOnde = simulation.run (onde, pasDeTemps, decimation, fichierImages)
+    anim = animeImages (fig, x, normeOnde)
+
 
+"""
+Balayage en énergie
+"""
+# paramètres du balayage : le paquet est relevé à mi-chemin entre la
+# barrière et le bord du domaine
+balayage = False
+ks = np.linspace (300, 1500, 100)
+distance = (centreV - x0) + (2*xMax - centreV) / 2
+# probabilité de transmission pour plusieurs hauteurs de barrière
+if balayage:
+    plt.figure ()
+    for hauteur in [0.5, 1, 2]:
+        simulationBarriere = Simulation1D (x, barriereGamow (x, centreV, hauteur*V0), dt)
+        transmis = simulationBarriere.balayageTransmission (x0, largeur, ks, centreV, distance)
+        # énergie du paquet, parti du fond du puits (-20 V)
+        plt.plot ((ks**2 / 2 - 20*hauteur*V0) / V0, transmis, label=f"$V = {hauteur} V_0$")
+    plt.title ("Probabilité de sortie du puits")
+    plt.xlabel ("$E / V_0$")
+    plt.ylabel ("$P(x > x_V)$")
+    plt.legend (loc='best')
+
+
+"""
+Approximation WKB
+"""
+# la grille couvre la zone interdite jusqu'au point de rebroussement des
+# énergies les plus basses, le fond du puits vaut -20 V0
+wkb = False
+verificationWKB = False
+xWKB = np.geomspace (x[0], 100, 4000)
+energies = np.linspace (0.05, 1, 5000) * 2*V0 / centreV**2
+if wkb:
+    table = TableWKB (xWKB, barriereGamow (xWKB, centreV, 1))
+    # loi de Geiger-Nuttall : log(demi-vie) affine en 1 / sqrt(E)
+    plt.figure ()
+    for hauteur in [0.5, 1, 2]:
+        transmis = table.transmission (energies*hauteur, hauteur*V0)
+        tau = demiVie (energies*hauteur, transmis, centreV, -20*hauteur*V0)
+        plt.plot (1 / np.sqrt (energies*hauteur / V0), np.log10 (tau), label=f"$V = {hauteur} V_0$")
+    plt.title ("Loi de Geiger-Nuttall (WKB)")
+    plt.xlabel ("$\\sqrt{V_0 / E}$")
+    plt.ylabel ("$\\log_{10} \\tau$")
+    plt.legend (loc='best')
+    # comparaison avec la propagation complète du paquet d'onde
+    if verificationWKB:
+        ksVerification = np.linspace (850, 1050, 30)
+        transmisWKB, transmisSimulation = verifieWKB (table, Simulation1D (x, barriereGamow (x, centreV, V0), dt),
+            V0, x0, largeur, ksVerification, centreV, distance)
+        plt.figure ()
+        energiesVerification = (ksVerification**2 / 2 - 20*V0) / V0
+        plt.semilogy (energiesVerification, transmisWKB, label="WKB")
+        plt.semilogy (energiesVerification, transmisSimulation, 'o', label="propagation")
+        plt.title ("Transmission de la barrière de Gamow")
+        plt.xlabel ("$E / V_0$")
+        plt.ylabel ("$T(E)$")
+        plt.legend (loc='best')
 
-# animation de la solution
-line, = plt.plot ([], [], 'darkorange', label=r"$|\psi (x, t)|^2$")
-def animate (i):
-    line.set_data (x, normeOnde[i, :])
-    return line,
-plt.legend (loc='best')
-anim = animation.FuncAnimation(fig, animate, frames=pasDeTemps, interval=10, blit=True, repeat=True)
 plt.show()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+  Résolution de l'équation de schrodinger à une dimension (hbar = m = 1) :
+  potentiels, propagateurs et simulation réutilisable
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import lapack, eigh_tridiagonal
+
+
+"""
+Ondes et potentiels
+"""
+# paquet d'onde incident non normalisé
+def paquetOndeIncident (x, xCentre, largeur, k):
+    paquet = np.exp (- (x - xCentre)**2 / (2*largeur**2))
+    propagation = np.exp (1j * k * x)
+    return paquet * propagation
+
+# barrière de potentiel "carrée"
+def barriere (x, xCentre, largeur, amplitude):
+    carree = np.exp (-np.power ((x - xCentre) / largeur, 128))
+    return amplitude * carree
+
+# barrière gamow
+def barriereGamow (x, xCentre, amplitude):
+    coulomb = (1 + np.sign (x - xCentre)) / x**2
+    forte = 10 * (1 - np.sign (x - xCentre))
+    return amplitude * (coulomb - forte)
+
+# potentiel imaginaire absorbant -iW(x) : nul à l'intérieur du domaine, W
+# croît quadratiquement dans une couche d'épaisseur donnée sur chaque bord
+def potentielAbsorbant (x, epaisseur, amplitude, gauche=True, droite=True):
+    profondeur = np.zeros (len (x))
+    if gauche:
+        profondeur += np.maximum (x[0] + epaisseur - x, 0)
+    if droite:
+        profondeur += np.maximum (x - (x[-1] - epaisseur), 0)
+    return -1j * amplitude * (profondeur / epaisseur)**2
+
+
+"""
+Opérateurs et propagateurs
+"""
+# operateur d'évolution
+def operateurEvolution (I, H, dt):
+    return (I - 1j*dt/2 * H)
+
+# hamiltonien discrétisé H = Ec + V
+def hamiltonien (potentiel, dx):
+    n = len (potentiel)
+    typeH = np.result_type (potentiel, 1.0)
+    Ec = (-1 / (2 * dx**2)) * sp.diags ([1, -2, 1], [-1, 0, 1], shape=(n, n), dtype=typeH)
+    V = sp.diags (potentiel, 0, shape=(n, n))
+    return Ec + V
+
+# propagateur de Crank-Nicolson : les deux opérateurs sont construits une
+# seule fois et (1 + iH dt/2) est factorisé une seule fois (LU tridiagonale),
+# chaque pas de temps ne coûte alors qu'une résolution en O(n)
+#     psi(x, t) = U(t) psi(x, 0)
+# <=> U(-t/2) psi(x, t) = U(t/2) psi(x, 0)
+#  => (1 + iH dt/2) psi(x, t) = (1 - iH dt/2) psi(x, 0)   si dt << 1
+class PropagateurCrankNicolson:
+    def __init__ (self, H, dt):
+        I = sp.identity (H.shape[0], format='dia')
+        gauche = operateurEvolution (I, H, -dt)
+        self.droite = operateurEvolution (I, H, dt).tocsr ()
+        dl, d, du, du2, ipiv, info = lapack.zgttrf (
+            gauche.diagonal (-1), gauche.diagonal (), gauche.diagonal (1))
+        self.lu = (dl, d, du, du2, ipiv)
+
+    # résout (1 + iH dt/2) psi = second, une colonne par second membre
+    def resout (self, second):
+        onde, info = lapack.zgttrs (*self.lu, second)
+        return onde
+
+    # avance l'onde d'un pas de temps dt
+    def avance (self, onde):
+        return self.resout (self.droite @ onde)
+
+# propagateur de Fourier "split-step" (Strang) : demi-pas de potentiel, pas
+# cinétique dans l'espace des k puis demi-pas de potentiel, soit deux FFT par
+# pas de temps (conditions aux limites périodiques)
+class PropagateurFourier:
+    def __init__ (self, x, potentiel, dt):
+        k = 2*np.pi * np.fft.fftfreq (len (x), x[1] - x[0])
+        self.phaseCinetique = np.exp (-1j * k**2 / 2 * dt)
+        self.demiPhasePotentiel = np.exp (-1j * potentiel * dt / 2)
+
+    # avance l'onde d'un pas de temps dt
+    def avance (self, onde):
+        onde = self.demiPhasePotentiel * onde
+        onde = np.fft.ifft (self.phaseCinetique * np.fft.fft (onde))
+        return self.demiPhasePotentiel * onde
+
+# propagateur dans la base propre de H (tridiagonale symétrique) : l'onde
+# initiale est projetée une seule fois sur les états propres, l'onde à un
+# instant t quelconque est alors une somme pondérée par exp(-iEt), sans
+# intégrer les instants précédents (mémoire en n^2)
+class PropagateurPropre:
+    def __init__ (self, H, onde):
+        self.energies, self.etats = eigh_tridiagonal (H.diagonal (), H.diagonal (1))
+        self.coefficients = self.etats.T @ onde
+
+    # onde à l'instant t
+    def onde (self, t):
+        return self.etats @ (self.coefficients * np.exp (-1j * self.energies * t))
+
+# vitesse de groupe d'un paquet libre pour le schéma de Crank-Nicolson
+# discrétisé (k pour dx, dt -> 0, beaucoup moins si k dx ou k^2 dt ~ 1)
+def vitesseGroupe (k, dx, dt):
+    omega = (1 - np.cos (k * dx)) / dx**2
+    return np.sin (k * dx) / dx / (1 + (omega * dt / 2)**2)
+
+
+"""
+Enregistrement des images
+"""
+# enregistre |psi|^2 tous les `decimation` pas de temps, dans un fichier .npy
+# projeté en mémoire si un chemin est donné : la mémoire utilisée ne dépend
+# alors pas de la durée simulée. n est la taille (ou la forme) d'une image
+class EnregistreurImages:
+    def __init__ (self, chemin, n, pasDeTemps, decimation=1, dtype=np.float32):
+        self.decimation = decimation
+        forme = (pasDeTemps // decimation + 1,) + tuple (np.atleast_1d (n).tolist ())
+        if chemin is None:
+            self.images = np.zeros (forme, dtype=dtype)
+        else:
+            self.images = np.lib.format.open_memmap (
+                chemin, mode='w+', dtype=dtype, shape=forme)
+
+    # enregistre l'onde si le pas de temps i est un multiple de la décimation
+    def ajoute (self, i, onde):
+        if i % self.decimation == 0:
+            self.images[i // self.decimation] = abs (onde)**2
+
+    # termine l'écriture et renvoie les images, relues à la demande
+    def ferme (self):
+        if not isinstance (self.images, np.memmap):
+            return self.images
+        chemin = self.images.filename
+        self.images.flush ()
+        del self.images
+        return np.load (chemin, mmap_mode='r')
+
+
+"""
+Simulation
+"""
+# simulation d'un paquet d'onde sur la grille x dans un potentiel donné
+# moteur : 'crank-nicolson', 'fourier' ou 'propre' (hamiltonien réel)
+class Simulation1D:
+    def __init__ (self, x, potentiel, dt, moteur='crank-nicolson'):
+        self.x = x
+        self.dx = x[1] - x[0]
+        self.potentiel = potentiel
+        self.dt = dt
+        self.moteur = moteur
+        self.H = hamiltonien (potentiel, self.dx)
+
+    # propagateur associé au moteur choisi, l'onde initiale n'est utile qu'au
+    # moteur 'propre'
+    def propagateur (self, onde=None):
+        if self.moteur == 'propre':
+            if np.iscomplexobj (self.potentiel):
+                raise ValueError ("le moteur 'propre' demande un potentiel réel, "
+                    "il est incompatible avec une couche absorbante (potentiel complexe)")
+            return PropagateurPropre (self.H, onde)
+        if self.moteur == 'fourier':
+            return PropagateurFourier (self.x, self.potentiel, self.dt)
+        if self.moteur == 'crank-nicolson':
+            return PropagateurCrankNicolson (self.H, self.dt)
+        raise ValueError (f"moteur inconnu : {self.moteur!r}, les moteurs disponibles "
+            "sont 'crank-nicolson', 'fourier' et 'propre'")
+
+    # intègre l'onde sur pasDeTemps pas de temps et renvoie |psi|^2 tous les
+    # `decimation` pas (l'image 0 est l'onde initiale), en mémoire ou dans le
+    # fichier .npy `chemin`
+    def run (self, onde, pasDeTemps, decimation=1, chemin=None):
+        propagateur = self.propagateur (onde)
+        enregistreur = EnregistreurImages (chemin, len (onde), pasDeTemps, decimation)
+        if self.moteur == 'propre':
+            for i in range (0, pasDeTemps + 1, decimation):
+                enregistreur.ajoute (i, propagateur.onde (i * self.dt))
+            return enregistreur.ferme ()
+        enregistreur.ajoute (0, onde)
+        for i in range (1, pasDeTemps + 1):
+            onde = propagateur.avance (onde)
+            enregistreur.ajoute (i, onde)
+        return enregistreur.ferme ()
+
+    # probabilité de transmission au-delà de xBarriere en fonction de k : un
+    # paquet par valeur de k, tous propagés ensemble (une colonne par paquet)
+    # avec une seule factorisation de Crank-Nicolson. Chaque paquet est relevé
+    # à l'instant où, libre, il aurait parcouru la distance d
+    def balayageTransmission (self, x0, largeur, ks, xBarriere, d):
+        x = self.x
+        propagateur = PropagateurCrankNicolson (self.H, self.dt)
+        ondes = paquetOndeIncident (x[:, None], x0, largeur, ks[None, :])
+        norme = np.sum (abs (ondes)**2, axis=0)
+        temps = d / vitesseGroupe (ks, self.dx, self.dt)
+        pas = np.maximum (np.rint (temps / self.dt).astype (int), 1)
+        transmis = np.zeros (len (ks))
+        actifs = np.arange (len (ks))
+        for i in range (1, pas.max () + 1):
+            ondes = propagateur.avance (ondes)
+            releve = (pas[actifs] == i)
+            if releve.any ():
+                densite = abs (ondes[:, releve])**2
+                transmis[actifs[releve]] = densite[x > xBarriere].sum (axis=0) / norme[actifs[releve]]
+                # les paquets relevés ne sont plus propagés
+                ondes = ondes[:, ~releve]
+                actifs = actifs[~releve]
+        return transmis
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+  Résolution de l'équation de schrodinger à deux dimensions (hbar = m = 1)
+  par directions alternées (ADI), l'onde est un tableau psi[y, x]
+"""
+
+import numpy as np
+from schrodinger_1d import (hamiltonien, potentielAbsorbant,
+    PropagateurCrankNicolson, EnregistreurImages)
+
+
+"""
+Ondes et potentiels
+"""
+# paquet d'onde incident non normalisé, se propageant selon x
+def paquetOndeIncident2D (X, Y, xCentre, yCentre, largeur, k):
+    paquet = np.exp (- ((X - xCentre)**2 + (Y - yCentre)**2) / (2*largeur**2))
+    propagation = np.exp (1j * k * X)
+    return paquet * propagation
+
+# paroi d'épaisseur donnée en x = xCentre, percée de `nombre` fentes de
+# largeur `largeurFente` espacées de `ecart` (nombre = 0 : barrière pleine)
+def paroiFentes (X, Y, xCentre, epaisseur, nombre, largeurFente, ecart, amplitude):
+    paroi = abs (X - xCentre) < epaisseur / 2
+    for i in range (nombre):
+        centreFente = (i - (nombre - 1)/2) * ecart
+        paroi = paroi & (abs (Y - centreFente) > largeurFente / 2)
+    return amplitude * paroi
+
+# couches absorbantes sur les quatre bords
+def potentielAbsorbant2D (x, y, epaisseur, amplitude):
+    absorbantX = potentielAbsorbant (x, epaisseur, amplitude)
+    absorbantY = potentielAbsorbant (y, epaisseur, amplitude)
+    return absorbantX[None, :] + absorbantY[:, None]
+
+
+"""
+Propagateur et simulation
+"""
+# propagateur ADI : demi-pas de potentiel (phase diagonale), pas cinétique de
+# Crank-Nicolson par directions alternées (Peaceman-Rachford)
+#     (1 + iTx dt/2) psi* = (1 - iTy dt/2) psi
+#     (1 + iTy dt/2) psi' = (1 - iTx dt/2) psi*
+# puis demi-pas de potentiel. Les lignes (et les colonnes) partagent la même
+# matrice tridiagonale, factorisée une seule fois : chaque demi-pas est une
+# seule résolution avec une colonne par ligne (ou par colonne) de la grille
+class PropagateurADI:
+    def __init__ (self, x, y, potentiel, dt):
+        self.cnX = PropagateurCrankNicolson (hamiltonien (np.zeros (len (x)), x[1] - x[0]), dt)
+        self.cnY = PropagateurCrankNicolson (hamiltonien (np.zeros (len (y)), y[1] - y[0]), dt)
+        self.demiPhasePotentiel = np.exp (-1j * potentiel * dt / 2)
+
+    # avance l'onde d'un pas de temps dt
+    def avance (self, onde):
+        onde = self.demiPhasePotentiel * onde
+        # implicite selon x : une résolution par ligne
+        onde = self.cnX.resout ((self.cnY.droite @ onde).T).T
+        # implicite selon y : une résolution par colonne
+        onde = self.cnY.resout ((self.cnX.droite @ onde.T).T)
+        return self.demiPhasePotentiel * onde
+
+# simulation d'un paquet d'onde sur la grille (x, y) dans un potentiel V[y, x]
+class Simulation2D:
+    def __init__ (self, x, y, potentiel, dt):
+        self.x = x
+        self.y = y
+        self.potentiel = potentiel
+        self.dt = dt
+
+    # intègre l'onde sur pasDeTemps pas de temps et renvoie |psi|^2 tous les
+    # `decimation` pas (l'image 0 est l'onde initiale), en mémoire ou dans le
+    # fichier .npy `chemin`
+    def run (self, onde, pasDeTemps, decimation=1, chemin=None):
+        propagateur = PropagateurADI (self.x, self.y, self.potentiel, self.dt)
+        enregistreur = EnregistreurImages (chemin, onde.shape, pasDeTemps, decimation)
+        enregistreur.ajoute (0, onde)
+        for i in range (1, pasDeTemps + 1):
+            onde = propagateur.avance (onde)
+            enregistreur.ajoute (i, onde)
+        return enregistreur.ferme ()
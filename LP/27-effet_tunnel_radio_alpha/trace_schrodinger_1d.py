@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+  Tracés et animations des simulations de schrodinger_1d
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+from matplotlib.widgets import Slider
+
+# trace la barrière (partie réelle du potentiel)
+def traceBarriere (x, V, V0, titre, echelle=1):
+    plt.title (titre)
+    plt.plot (x, np.real (V) / V0 / echelle, label='$V(x)$')
+    plt.xlabel ("$x$ [unité arbitraire]")
+    plt.ylabel ("$V(x) / V_0$")
+
+# anime des images |psi|^2 déjà calculées
+def animeImages (fig, x, images, intervalle=10):
+    line, = plt.plot ([], [], 'darkorange', label=r"$|\psi (x, t)|^2$")
+    plt.legend (loc='best')
+    def animate (i):
+        line.set_data (x, images[i, :])
+        return line,
+    return animation.FuncAnimation(fig, animate, frames=len (images), interval=intervalle, blit=True, repeat=True)
+
+# anime |psi(t)|^2 avec un curseur temporel entre 0 et T : l'image de l'instant
+# choisi est calculée à la demande par le propagateur, l'animation avance le
+# curseur de dt à chaque image. Le curseur doit être conservé par l'appelant
+def animeInstants (fig, x, propagateur, T, dt, intervalle=10):
+    line, = plt.plot ([], [], 'darkorange', label=r"$|\psi (x, t)|^2$")
+    plt.legend (loc='best')
+    plt.subplots_adjust (bottom=0.2)
+    curseur = Slider (fig.add_axes ([0.15, 0.05, 0.7, 0.03]), '$t$', 0, T, valinit=0)
+    def afficheInstant (t):
+        line.set_data (x, abs (propagateur.onde (t))**2)
+    curseur.on_changed (afficheInstant)
+    afficheInstant (0)
+    def animate (i):
+        curseur.set_val ((curseur.val + dt) % T)
+        return line,
+    anim = animation.FuncAnimation(fig, animate, interval=intervalle, cache_frame_data=False)
+    return anim, curseur
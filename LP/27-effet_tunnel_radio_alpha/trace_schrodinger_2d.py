@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+  Tracés et animations des simulations de schrodinger_2d
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+
+# trace le contour des obstacles (V > 0)
+def traceObstacles (x, y, V):
+    plt.contour (x, y, np.real (V) > 0, levels=[0.5], colors='white', linewidths=1)
+    plt.xlabel ("$x$ [unité arbitraire]")
+    plt.ylabel ("$y$ [unité arbitraire]")
+
+# anime des images |psi|^2 déjà calculées (lues à la demande si elles sont
+# projetées en mémoire), chaque image est normalisée par son maximum
+def animeImages2D (fig, x, y, images, intervalle=30):
+    etendue = (x[0], x[-1], y[0], y[-1])
+    image = plt.imshow (images[0], origin='lower', extent=etendue, cmap='inferno', vmin=0, vmax=1)
+    def animate (i):
+        image.set_data (images[i] / max (images[i].max (), 1e-30))
+        return image,
+    return animation.FuncAnimation(fig, animate, frames=len (images), interval=intervalle, blit=True, repeat=True)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+  Approximation WKB de l'effet tunnel (hbar = m = 1) : facteurs de
+  transmission tabulés pour des vecteurs d'énergies et de hauteurs de barrière
+"""
+
+import numpy as np
+from scipy.integrate import trapezoid
+
+# table des facteurs de transmission WKB T = exp(-2 int sqrt(2(V - E)) dx)
+# pour un potentiel V = V0 * forme(x) échantillonné sur la grille x, qui doit
+# couvrir toute la zone classiquement interdite. Les résultats sont conservés
+# pour chaque couple (E, V0) déjà calculé
+class TableWKB:
+    def __init__ (self, x, forme, taillePaquet=1024):
+        self.x = x
+        self.forme = forme
+        self.taillePaquet = taillePaquet
+        self.cache = {}
+
+    # intégrale de sqrt(2(V - E)) sur la zone interdite, pour des tableaux 1D
+    # d'énergies et de hauteurs
+    def integrale (self, E, V0):
+        V = V0[:, None] * self.forme[None, :]
+        kappa = np.sqrt (2 * np.maximum (V - E[:, None], 0))
+        return trapezoid (kappa, self.x, axis=1)
+
+    # facteur de transmission T(E, V0), les énergies et les hauteurs sont
+    # diffusées l'une sur l'autre. Seuls les couples absents de la table sont
+    # calculés, par paquets pour borner la mémoire
+    def transmission (self, energies, amplitudes):
+        E, V0 = np.broadcast_arrays (np.asarray (energies, dtype=float),
+            np.asarray (amplitudes, dtype=float))
+        cles = list (zip (E.ravel ().tolist (), V0.ravel ().tolist ()))
+        manquants = np.array ([cle for cle in dict.fromkeys (cles) if cle not in self.cache])
+        for debut in range (0, len (manquants), self.taillePaquet):
+            paquet = manquants[debut:debut + self.taillePaquet]
+            T = np.exp (-2 * self.integrale (paquet[:, 0], paquet[:, 1]))
+            self.cache.update (zip (map (tuple, paquet.tolist ()), T.tolist ()))
+        return np.array ([self.cache[cle] for cle in cles]).reshape (E.shape)
+
+# demi-vie d'une particule d'énergie E dans un puits de largeur a et de fond
+# Vpuits : elle frappe la barrière v / 2a fois par unité de temps et la
+# traverse avec la probabilité T
+def demiVie (E, T, largeurPuits, Vpuits):
+    vitesse = np.sqrt (2 * (E - Vpuits))
+    return np.log (2) * 2*largeurPuits / (vitesse * T)
+
+# comparaison avec le propagateur complet : transmission WKB moyennée sur la
+# distribution des vecteurs d'onde du paquet gaussien (|phi(k')|^2 de largeur
+# 1 / largeur autour de k, les composantes rapides dominent si la barrière est
+# opaque) et probabilité de transmission des paquets propagés par la
+# simulation, pour chaque k. L'énergie d'un paquet parti de x0 est
+# k^2/2 + V(x0)
+def verifieWKB (table, simulation, V0, x0, largeur, ks, xBarriere, d, nombreK=201):
+    ecarts = np.linspace (-5, 5, nombreK) / largeur
+    poids = np.exp (-(ecarts * largeur)**2)
+    kPaquet = np.maximum (ks[:, None] + ecarts[None, :], 0)
+    Vdepart = np.interp (x0, simulation.x, np.real (simulation.potentiel))
+    transmis = table.transmission (kPaquet**2 / 2 + Vdepart, V0)
+    transmisWKB = (transmis * poids).sum (axis=1) / poids.sum ()
+    transmisSimulation = simulation.balayageTransmission (x0, largeur, ks, xBarriere, d)
+    return transmisWKB, transmisSimulation
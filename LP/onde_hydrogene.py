@@ -3,13 +3,18 @@
 Trace les premières fonctions d'onde d'un atome hydrogénoïde
 """
 
+import os
+import tempfile
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib import cm, colors
 import scipy.special as spe
-from scipy.integrate import odeint
+from scipy.integrate import odeint, cumulative_trapezoid
 
 #
 def densiteRadiale (r, n, l):
@@ -19,34 +24,218 @@ def densiteRadiale (r, n, l):
     laguerre = spe.assoc_laguerre (r0, N, 2*l + 1)
     return coeff * np.exp (-r/n) * (r0)**l * laguerre
 
-#
+# phi azimut et theta angle polaire, sph_harm a été remplacée par sph_harm_y
+# (ordre des arguments inversé) à partir de SciPy 1.15
 def harmoniqueSpherique (phi, theta, l, m):
+    if hasattr (spe, 'sph_harm_y'):
+        return spe.sph_harm_y (l, m, theta, phi).real
     return spe.sph_harm (m, l, phi, theta).real
 
 #
 def ondeHydrogene(r, phi, theta, n, l, m):
     return densiteRadiale (r, n, l) * harmoniqueSpherique (phi, theta, l, m)
 
+# indice de R_nl dans le tableau de radialesRecurrence
+def indiceRadial (n, l):
+    return n*(n - 1)//2 + l
+
+# toutes les parties radiales R_nl pour 1 <= n <= nMax en une passe : pour
+# chaque n, les polynômes de Laguerre de tous les l sont obtenus ensemble par
+# la récurrence à trois termes
+#   (k + 1) L_{k+1} = (2k + 1 + alpha - x) L_k - (k + alpha) L_{k-1}
+# le degré n - l - 1 étant atteint pour chaque l au fil de la récurrence
+def radialesRecurrence (r, nMax):
+    r = np.asarray (r, dtype=float)
+    radiales = np.empty ((indiceRadial (nMax + 1, 0),) + r.shape)
+    for n in range (1, nMax + 1):
+        l = np.arange (n).reshape ((n,) + (1,)*r.ndim)
+        alpha = 2*l + 1
+        x = 2*r / n
+        laguerre = np.empty ((n,) + r.shape)
+        precedent = np.zeros ((n,) + r.shape)
+        courant = np.ones ((n,) + r.shape)
+        for k in range (n):
+            # degré k atteint pour l = n - k - 1, seuls les l inférieurs
+            # continuent la récurrence
+            actifs = n - k - 1
+            laguerre[actifs] = courant[actifs]
+            a = alpha[:actifs]
+            suivant = ((2*k + 1 + a - x) * courant[:actifs] - (k + a) * precedent[:actifs]) / (k + 1)
+            precedent, courant = courant[:actifs], suivant
+        # normalisation calculée en logarithme pour éviter les factorielles
+        logCoeff = 0.5 * (3*np.log (2/n) + spe.gammaln (n - l) - np.log (2*n) - spe.gammaln (n + l + 1))
+        debut = indiceRadial (n, 0)
+        radiales[debut:debut + n] = np.exp (logCoeff - r/n) * x**l * laguerre
+    return radiales
+
+# indice de Y_lm dans le tableau de harmoniquesRecurrence
+def indiceHarmonique (l, m):
+    return l*l + l + m
+
+# toutes les harmoniques sphériques (partie réelle, comme harmoniqueSpherique)
+# pour 0 <= l <= lMax en une passe, par la récurrence stable des fonctions de
+# Legendre associées normalisées
+#   P_m^m = -sqrt((2m + 1) / 2m) sin(theta) P_{m-1}^{m-1}
+#   P_l^m = a_lm (cos(theta) P_{l-1}^m - P_{l-2}^m / a_{l-1,m})
+# avec a_lm = sqrt((4l^2 - 1) / (l^2 - m^2)), puis Re Y_l^m = P_l^|m| cos(m phi)
+# au signe (-1)^m près pour m < 0
+def harmoniquesRecurrence (phi, theta, lMax):
+    phi, theta = np.broadcast_arrays (np.asarray (phi, dtype=float), np.asarray (theta, dtype=float))
+    c = np.cos (theta)
+    s = np.sin (theta)
+    harmoniques = np.empty ((indiceHarmonique (lMax + 1, -lMax - 1),) + phi.shape)
+    diagonale = np.full (phi.shape, np.sqrt (1 / (4*np.pi)))
+    for m in range (lMax + 1):
+        if m > 0:
+            diagonale = -np.sqrt ((2*m + 1) / (2*m)) * s * diagonale
+        cosinus = np.cos (m * phi)
+        precedent = np.zeros (phi.shape)
+        courant = diagonale
+        aPrecedent = 1
+        for l in range (m, lMax + 1):
+            if l > m:
+                a = np.sqrt ((4*l*l - 1) / (l*l - m*m))
+                precedent, courant = courant, a * (c * courant - precedent / aPrecedent)
+                aPrecedent = a
+            harmoniques[indiceHarmonique (l, m)] = courant * cosinus
+            if m > 0:
+                harmoniques[indiceHarmonique (l, -m)] = (-1)**m * courant * cosinus
+    return harmoniques
+
+
+# grille du plan y = 0 en coordonnées polaires, x = r sin(a) et z = r cos(a)
+# avec a dans [-pi, pi] : les coordonnées sont calculées une seule fois, les
+# parties radiales (par n, l) et angulaires (par l, m) sont mémorisées sur des
+# tableaux 1D et combinées par diffusion
+class GrillePlan:
+    def __init__ (self, limite = 50, pointsR = 500, pointsAngle = 721):
+        # le disque de rayon limite*sqrt(2) couvre le carré de tracé
+        self.limite = limite
+        self.r = np.linspace (0, np.sqrt (2) * limite, pointsR)
+        angle = np.linspace (-np.pi, np.pi, pointsAngle)
+        self.theta = abs (angle)
+        self.phi = np.where (angle < 0, np.pi, 0)
+        self.x = self.r[:, None] * np.sin (angle)[None, :]
+        self.z = self.r[:, None] * np.cos (angle)[None, :]
+        self.radiales = {}
+        self.angulaires = {}
+        self.cartesiens = {}
+
+    # partie radiale R_nl (r)
+    def radiale (self, n, l):
+        if (n, l) not in self.radiales:
+            self.radiales[(n, l)] = densiteRadiale (self.r, n, l)
+        return self.radiales[(n, l)]
+
+    # partie angulaire Y_lm (theta, phi)
+    def angulaire (self, l, m):
+        if (l, m) not in self.angulaires:
+            self.angulaires[(l, m)] = harmoniqueSpherique (self.phi, self.theta, l, m)
+        return self.angulaires[(l, m)]
+
+    # remplit les tables de toutes les orbitales n <= nMax en une passe
+    def precalcule (self, nMax):
+        radiales = radialesRecurrence (self.r, nMax)
+        harmoniques = harmoniquesRecurrence (self.phi, self.theta, nMax - 1)
+        for n in range (1, nMax + 1):
+            for l in range (n):
+                self.radiales[(n, l)] = radiales[indiceRadial (n, l)]
+        for l in range (nMax):
+            for m in range (-l, l + 1):
+                self.angulaires[(l, m)] = harmoniques[indiceHarmonique (l, m)]
+
+    # fonction d'onde psi_nlm sur la grille
+    def onde (self, n, l, m):
+        return self.radiale (n, l)[:, None] * self.angulaire (l, m)[None, :]
+
+    # champ de la grille polaire interpolé (bilinéaire) sur une grille
+    # cartésienne points x points du carré de tracé, lignes selon z, pour un
+    # affichage rapide avec imshow. Les indices d'interpolation sont calculés
+    # une seule fois par taille
+    def cartesien (self, champ, points = 400):
+        if points not in self.cartesiens:
+            coordonnees = np.linspace (-self.limite, self.limite, points)
+            x, z = np.meshgrid (coordonnees, coordonnees)
+            iR = np.hypot (x, z) / (self.r[1] - self.r[0])
+            iA = (np.arctan2 (x, z) + np.pi) / (2*np.pi) * (len (self.theta) - 1)
+            i = np.minimum (iR.astype (int), len (self.r) - 2)
+            j = np.minimum (iA.astype (int), len (self.theta) - 2)
+            self.cartesiens[points] = (i, j, iR - i, iA - j)
+        i, j, u, v = self.cartesiens[points]
+        return ((1 - u) * ((1 - v) * champ[i, j] + v * champ[i, j + 1])
+            + u * ((1 - v) * champ[i + 1, j] + v * champ[i + 1, j + 1]))
+
+
+# superposition d'états sum c_k psi_k exp(-i E_n t) avec E_n = -1 / 2n^2
+# (unités atomiques), etats est une liste de (c, n, l, m) : la base est
+# calculée une seule fois sur la grille, chaque instant n'est qu'une petite
+# combinaison linéaire
+class Superposition:
+    def __init__ (self, grille, etats):
+        coefficients = np.array ([c for c, n, l, m in etats], dtype=complex)
+        self.coefficients = coefficients / np.linalg.norm (coefficients)
+        self.energies = np.array ([-1 / (2*n**2) for c, n, l, m in etats])
+        self.base = np.stack ([grille.onde (n, l, m) for c, n, l, m in etats])
+        self.poids = 4*np.pi * grille.r[:, None]**2
+
+    # densité de présence 4 pi r^2 |psi|^2 à l'instant t
+    def densite (self, t):
+        phases = self.coefficients * np.exp (-1j * self.energies * t)
+        return self.poids * abs (np.tensordot (phases, self.base, axes=1))**2
+
+    # majorant de la densité à tout instant, pour fixer l'échelle de couleur
+    def densiteMax (self):
+        module = np.tensordot (abs (self.coefficients), abs (self.base), axes=1)
+        return (self.poids * module**2).max ()
+
+    # période du battement le plus lent (1 si tous les états sont dégénérés)
+    def periode (self):
+        ecarts = abs (self.energies[:, None] - self.energies[None, :])
+        ecarts = ecarts[ecarts > 1e-12]
+        return 2*np.pi / ecarts.min () if len (ecarts) > 0 else 1
+
+
+# tire `nombre` valeurs selon la densité tabulée sur une grille 1D, par
+# inversion de la fonction de répartition
+def tirageInverse (grille, densite, nombre, generateur):
+    repartition = cumulative_trapezoid (densite, grille, initial=0)
+    return np.interp (generateur.random (nombre), repartition / repartition[-1], grille)
+
+# tire `nombre` positions de l'électron selon |psi_nlm|^2 : la densité est le
+# produit des lois marginales r^2 R_nl^2, sin(theta) P_l^m(cos theta)^2 et
+# cos(m phi)^2, chaque coordonnée est tirée indépendamment
+def echantillonneOrbitale (n, l, m, nombre, points = 4096, graine = None):
+    generateur = np.random.default_rng (graine)
+    r = np.linspace (0, 4*n**2 + 20, points)
+    theta = np.linspace (0, np.pi, points)
+    phi = np.linspace (0, 2*np.pi, points)
+    rs = tirageInverse (r, (r * densiteRadiale (r, n, l))**2, nombre, generateur)
+    densiteTheta = np.sin (theta) * harmoniquesRecurrence (0, theta, l)[indiceHarmonique (l, abs (m))]**2
+    thetas = tirageInverse (theta, densiteTheta, nombre, generateur)
+    phis = tirageInverse (phi, np.cos (m * phi)**2, nombre, generateur)
+    x = rs * np.sin (thetas) * np.cos (phis)
+    y = rs * np.sin (thetas) * np.sin (phis)
+    z = rs * np.cos (thetas)
+    return x, y, z
+
+# histogramme 3D des positions tirées, pour un rendu en voxels
+def voxelise (x, y, z, limite = 50, taille = 64):
+    bornes = [(-limite, limite)] * 3
+    voxels, aretes = np.histogramdd ((x, y, z), bins=taille, range=bornes)
+    return voxels
+
 
 # trace la densité de présence selon le plan y
-def traceDensitePresence (n, l, m, limite = 50):
-    # definit l'espace de tracé
-    x1d = np.linspace (-limite, limite, 500)
-    z1d = np.linspace (-limite, limite, 500)
-    x, z = np.meshgrid (x1d, z1d)
-    y   = 0
-
-    # calcule les coordonnées sphériques
-    r     = np.sqrt (x**2 + y**2 + z**2)
-    theta = np.arctan2 (np.sqrt(x**2+y**2), z)
-    phi   = np.arctan2 (y, x)
+def traceDensitePresence (grille, n, l, m):
     # calcule la densité de présence
-    psi = 4*np.pi * r**2 * ondeHydrogene (r, phi, theta, n, l, m)**2
+    psi = 4*np.pi * grille.r[:, None]**2 * grille.onde (n, l, m)**2
 
     # trace la densité de présence en coordonnée sphérique
     plt.figure (figsize = (20, 16))
-    plt.contourf (x, z, psi, 20, cmap='seismic', alpha=0.6)
+    plt.contourf (grille.x, grille.z, psi, 20, cmap='seismic', alpha=0.6)
     plt.colorbar ()
+    plt.xlim (-grille.limite, grille.limite)
+    plt.ylim (-grille.limite, grille.limite)
     # légende du graphe
     plt.title (f"$4\pi r^2 |\psi|^2, \; n,l,m={n,l,m}$", fontsize=20)
     plt.xlabel ('X', fontsize=20)
@@ -74,7 +263,7 @@ def traceHarmonique3D (n, l, m):
       maxi = 0.1
     fcolors = (psi - mini) / (maxi - mini)
     # trace les harmoniques
-    fig = plt.figure (figsize = (80, 64))
+    fig = plt.figure (figsize = (20, 16))
     ax = fig.add_subplot (111, projection='3d')
     ax.plot_surface (x, y, z, facecolors=cm.seismic(fcolors), alpha=0.3)
     # trace la projection sur les axes
@@ -91,13 +280,137 @@ def traceHarmonique3D (n, l, m):
     ax.set_zlim (-1, 1)
 
 
-# trace les fonctions d'ondes pour n = 0, ..., 5
-nMin = 4
-nMax = 5
-for n in range (nMin, nMax):
-    for l in range (n):
-        for m in np.linspace (-l, l, 2*l + 1, dtype=(int)):
-            traceDensitePresence (n, l, m)
-            plt.show ()
-            # traceHarmonique3D (n, l, m)
-            # plt.show ()
+# trace un nuage de positions électroniques en 3D (au plus `affiches` points)
+def traceNuage3D (x, y, z, n, l, m, affiches = 50000, limite = 50):
+    pas = max (len (x) // affiches, 1)
+    fig = plt.figure (figsize = (16, 16))
+    ax = fig.add_subplot (111, projection='3d')
+    ax.scatter (x[::pas], y[::pas], z[::pas], s=0.5, c=z[::pas], cmap='seismic', alpha=0.3)
+    plt.title (f"$|\\psi|^2, \\; n,l,m={n,l,m}$", fontsize=20)
+    ax.set_xlim (-limite, limite)
+    ax.set_ylim (-limite, limite)
+    ax.set_zlim (-limite, limite)
+
+
+# anime la densité de présence d'une superposition d'états sur une période
+# du battement le plus lent : chaque image est rééchantillonnée sur une grille
+# cartésienne et seule l'image (imshow) est mise à jour, bien plus rapide à
+# redessiner qu'un maillage polaire
+def animeSuperposition (grille, etats, images = 300, intervalle = 20, points = 400):
+    superposition = Superposition (grille, etats)
+    temps = np.linspace (0, superposition.periode (), images, endpoint=False)
+    fig = plt.figure (figsize = (10, 8))
+    bornes = (-grille.limite, grille.limite, -grille.limite, grille.limite)
+    image = plt.imshow (grille.cartesien (superposition.densite (0), points), origin='lower',
+        extent=bornes, cmap='seismic', vmin=0, vmax=superposition.densiteMax ())
+    plt.colorbar ()
+    # légende du graphe
+    etiquette = ' + '.join (f"{c}|{n},{l},{m}>" for c, n, l, m in etats)
+    plt.title (f"$4\\pi r^2 |\\psi|^2$, {etiquette}", fontsize=16)
+    plt.xlabel ('X', fontsize=16)
+    plt.ylabel ('Y', fontsize=16)
+    def animate (i):
+        image.set_data (grille.cartesien (superposition.densite (temps[i]), points))
+        return image,
+    return animation.FuncAnimation (fig, animate, frames=images, interval=intervalle, blit=True, repeat=True)
+
+
+# empreinte d'une image : paramètres du tracé et source de ce script
+def empreinte (*parametres):
+    with open (__file__, 'rb') as source:
+        contenu = source.read ()
+    return hashlib.sha1 (contenu + repr (parametres).encode ()).hexdigest ()
+
+# grille propre à chaque processus de rendu, construite et précalculée
+# jusqu'à nMax à sa première tâche
+grilleProcessus = None
+
+# rend une orbitale dans un fichier image, sans fenêtre
+# genre : 'densite' (densité de présence) ou 'harmonique' (|Y_lm| en 3D)
+def rendOrbitale (tache):
+    global grilleProcessus
+    genre, n, l, m, nMax, fichier, dpi = tache
+    plt.switch_backend ('Agg')
+    if genre == 'densite':
+        if grilleProcessus is None:
+            grilleProcessus = GrillePlan ()
+            grilleProcessus.precalcule (nMax)
+        traceDensitePresence (grilleProcessus, n, l, m)
+    else:
+        traceHarmonique3D (n, l, m)
+    plt.savefig (fichier, dpi=dpi)
+    plt.close ('all')
+    return fichier
+
+# rend toutes les orbitales nMin <= n < nMax dans le dossier, réparties sur
+# un pool de processus. Les images dont les paramètres et la source n'ont
+# pas changé depuis le dernier rendu (empreintes.json) ne sont pas refaites.
+# Renvoie le nombre d'images rendues
+def rendAtlas (nMin, nMax, dossier = 'atlas', dpi = 100, harmoniques = False, processus = None):
+    os.makedirs (dossier, exist_ok=True)
+    cheminEmpreintes = os.path.join (dossier, 'empreintes.json')
+    empreintes = {}
+    if os.path.exists (cheminEmpreintes):
+        with open (cheminEmpreintes) as fichier:
+            empreintes = json.load (fichier)
+    genres = ['densite', 'harmonique'] if harmoniques else ['densite']
+    taches = []
+    nouvelles = {}
+    for n in range (nMin, nMax):
+        for l in range (n):
+            for m in range (-l, l + 1):
+                for genre in genres:
+                    nom = f'{genre}_{n}_{l}_{m}.png'
+                    cle = empreinte (genre, n, l, m, dpi)
+                    fichier = os.path.join (dossier, nom)
+                    if empreintes.get (nom) == cle and os.path.exists (fichier):
+                        continue
+                    taches.append ((genre, n, l, m, nMax, fichier, dpi))
+                    nouvelles[nom] = cle
+    if taches:
+        with ProcessPoolExecutor (processus) as pool:
+            list (pool.map (rendOrbitale, taches))
+        empreintes.update (nouvelles)
+        with open (cheminEmpreintes, 'w') as fichier:
+            json.dump (empreintes, fichier, indent=1)
+    return len (taches)
+
+
+if __name__ == '__main__':
+    # trace les fonctions d'ondes pour n = 0, ..., 5
+    nMin = 4
+    nMax = 5
+    # atlas : toutes les orbitales sont rendues dans des fichiers images en
+    # parallèle, sans fenêtre, au lieu d'être affichées une à une
+    atlas = False
+    if atlas:
+        rendAtlas (nMin, nMax, dpi=100)
+    else:
+        grille = GrillePlan ()
+        grille.precalcule (nMax)
+        for n in range (nMin, nMax):
+            for l in range (n):
+                for m in np.linspace (-l, l, 2*l + 1, dtype=(int)):
+                    traceDensitePresence (grille, n, l, m)
+                    plt.show ()
+                    # traceHarmonique3D (n, l, m)
+                    # plt.show ()
+
+    # nuage de points 3D d'une orbitale, exporté pour un rendu externe dans
+    # le dossier `dossierNuage` (environ 12 Mo par orbitale)
+    nuage = False
+    dossierNuage = tempfile.gettempdir ()
+    if nuage:
+        n, l, m = 4, 2, 1
+        x, y, z = echantillonneOrbitale (n, l, m, 1000000)
+        np.save (os.path.join (dossierNuage, f'nuage_{n}_{l}_{m}.npy'),
+            np.stack ((x, y, z), axis=1).astype (np.float32))
+        traceNuage3D (x, y, z, n, l, m)
+        plt.show ()
+
+    # évolution temporelle de la superposition (1s + 2p) / sqrt(2)
+    superposition = False
+    if superposition:
+        grille = GrillePlan (limite = 15)
+        anim = animeSuperposition (grille, [(1, 1, 0, 0), (1, 2, 1, 0)])
+        plt.show ()